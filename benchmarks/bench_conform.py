@@ -0,0 +1,112 @@
+"""Micro-benchmark of record conformance for a wide contact record.
+
+Compares the SDK's per-record schema walk (deselection, then recursive type
+conformance) with the `RecordConformer` that `HubspotStream` compiles once
+when `fast_record_conformance` is enabled, on a contact with 1,000 properties.
+
+Run with: `poetry run python benchmarks/bench_conform.py`
+"""
+
+from __future__ import annotations
+
+import copy
+import timeit
+import typing as t
+
+from singer_sdk import typing as th
+from singer_sdk._singerlib import SelectionMask
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import TypeConformanceLevel, _conform_record_data_types
+
+from tap_hubspot.conform import RecordConformer
+
+PROPERTIES_PER_RECORD = 1000
+RECORDS = 200
+REPEAT = 5
+
+
+def make_schema() -> dict:
+    """Return a contacts schema as built by `DynamicHubspotStream`."""
+    return th.PropertiesList(
+        th.Property("id", th.StringType),
+        th.Property(
+            "properties",
+            th.ObjectType(
+                *(
+                    th.Property(f"property_{p}", th.StringType)
+                    for p in range(PROPERTIES_PER_RECORD)
+                ),
+            ),
+        ),
+        th.Property("createdAt", th.DateTimeType),
+        th.Property("updatedAt", th.DateTimeType),
+        th.Property("archived", th.BooleanType),
+    ).to_dict()
+
+
+def make_record(i: int) -> dict:
+    """Return a synthetic contact carrying every property."""
+    return {
+        "id": str(i),
+        "properties": {
+            f"property_{p}": f"value {i}-{p}" for p in range(PROPERTIES_PER_RECORD)
+        },
+        "createdAt": "2024-01-01T00:00:00.000Z",
+        "updatedAt": "2024-01-02T00:00:00.000Z",
+        "archived": False,
+    }
+
+
+def records_per_second(
+    func: t.Callable[[], object],
+    setup: t.Callable[[], None],
+) -> float:
+    """Return the best records/sec of `func` over a few runs."""
+    timings = []
+    for _ in range(REPEAT):
+        setup()
+        timings.append(timeit.timeit(func, number=1))
+    return RECORDS / min(timings)
+
+
+def main() -> None:
+    """Print records/sec for each conformance path."""
+    schema = make_schema()
+    mask = SelectionMask()
+    conformer = RecordConformer(schema, mask)
+    originals = [make_record(i) for i in range(RECORDS)]
+    records: list[dict] = []
+
+    def setup() -> None:
+        # Both paths modify records in place, so each run gets fresh copies.
+        records[:] = copy.deepcopy(originals)
+
+    def before() -> list:
+        output = []
+        for record in records:
+            pop_deselected_record_properties(record, schema, mask)
+            conformed, _ = _conform_record_data_types(
+                record,
+                schema,
+                TypeConformanceLevel.RECURSIVE,
+                None,
+            )
+            output.append(conformed)
+        return output
+
+    def after() -> list:
+        return [conformer(record)[0] for record in records]
+
+    setup()
+    expected = before()
+    setup()
+    assert after() == expected  # noqa: S101
+
+    print(f"Synthetic contact: {PROPERTIES_PER_RECORD} properties")  # noqa: T201
+    for label, func in (("SDK schema walk", before), ("compiled conformer", after)):
+        rate = records_per_second(func, setup)
+        print(f"{label:<28}{rate:>14,.0f} records/sec")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""End-to-end throughput benchmark of the tap against a synthetic portal.
+
+Starts `mock_hubspot.py` on a local port, then syncs each stream in its own
+process with `TapHubspot` and reports, per stream: records, records/sec,
+requests, requests/sec, time to first record and peak RSS. Requests the tap
+sends to api.hubapi.com are redirected to the mock server; Singer messages are
+serialized as usual and discarded.
+
+Run with, for instance: `poetry run python benchmarks/bench_e2e.py
+--records 50000 --streams contacts,deals --config '{"prefetch_pages": 2}'`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+from singer_sdk._singerlib import RecordMessage
+
+from tap_hubspot.tap import TapHubspot
+
+if t.TYPE_CHECKING:
+    import requests
+    from singer_sdk._singerlib import Message
+
+HUBSPOT_URL = "https://api.hubapi.com"
+MOCK_SERVER = Path(__file__).with_name("mock_hubspot.py")
+PORTAL_OPTIONS = (
+    "records",
+    "properties",
+    "days",
+    "per_timestamp",
+    "archived",
+    "requests_per_ten_seconds",
+    "search_requests_per_second",
+    "error_rate",
+    "latency",
+    "token_ttl",
+)
+# Report columns: name, width and format spec.
+COLUMNS = (
+    ("stream", 26, ""),
+    ("records", 10, ",.0f"),
+    ("records/s", 11, ",.0f"),
+    ("requests", 10, ",.0f"),
+    ("requests/s", 12, ",.1f"),
+    ("first record s", 16, ",.3f"),
+    ("peak RSS MiB", 14, ",.1f"),
+)
+
+
+def format_row(values: dict[str, t.Any] | None = None) -> str:
+    """Return a report row, or the header without `values`."""
+    cells = []
+    for name, width, spec in COLUMNS:
+        align = "<" if name == "stream" else ">"
+        if values is None:
+            cells.append(f"{name:{align}{width}}")
+        else:
+            cells.append(f"{values[name]:{align}{width}{spec}}")
+    return "".join(cells)
+
+
+class RequestCounter:
+    """Thread-safe count of the requests sent."""
+
+    def __init__(self) -> None:  # noqa: D107
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def increment(self) -> None:
+        """Count a request."""
+        with self._lock:
+            self.count += 1
+
+
+def redirect_requests(base_url: str, counter: RequestCounter) -> None:
+    """Send every request for api.hubapi.com to `base_url`, counting them."""
+    send = HTTPAdapter.send
+
+    def redirected_send(
+        adapter: HTTPAdapter,
+        request: requests.PreparedRequest,
+        *args: t.Any,
+        **kwargs: t.Any,
+    ) -> requests.Response:
+        if request.url and request.url.startswith(HUBSPOT_URL):
+            request.url = base_url + request.url[len(HUBSPOT_URL) :]
+        counter.increment()
+        return send(adapter, request, *args, **kwargs)
+
+    HTTPAdapter.send = redirected_send  # type: ignore[method-assign,assignment]
+
+
+def peak_rss_mib() -> float:
+    """Return the peak resident set size of this process, in MiB."""
+    import resource  # noqa: PLC0415
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in KiB elsewhere.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_stream(stream_name: str, base_url: str, config: dict[str, t.Any]) -> dict:
+    """Sync one stream against the mock server and return its measurements."""
+    requests_sent = RequestCounter()
+    redirect_requests(base_url, requests_sent)
+    records = 0
+    first_record: float | None = None
+
+    tap = TapHubspot(config=config)
+    write_message = tap.write_message
+
+    def count_and_write_message(message: Message) -> None:
+        nonlocal records, first_record
+        if isinstance(message, RecordMessage) and message.stream == stream_name:
+            records += 1
+            if first_record is None:
+                first_record = time.perf_counter()
+        write_message(message)
+
+    # Streams write their messages through the tap.
+    tap.write_message = count_and_write_message  # type: ignore[method-assign]
+    for name, stream in tap.streams.items():
+        stream.selected = name == stream_name
+    discovery_requests = requests_sent.count
+
+    with Path(os.devnull).open("w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            started = time.perf_counter()
+            tap.sync_all()
+            elapsed = time.perf_counter() - started
+        finally:
+            sys.stdout = stdout
+
+    sync_requests = requests_sent.count - discovery_requests
+    return {
+        "stream": stream_name,
+        "records": records,
+        "records/s": records / elapsed,
+        "requests": sync_requests,
+        "requests/s": sync_requests / elapsed,
+        "first record s": (first_record or time.perf_counter()) - started,
+        "peak RSS MiB": peak_rss_mib(),
+    }
+
+
+def start_mock_server(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    """Start the mock server in a process of its own and return its URL."""
+    command = [sys.executable, str(MOCK_SERVER)]
+    for option in PORTAL_OPTIONS:
+        command += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)  # noqa: S603
+    assert server.stdout is not None  # noqa: S101
+    return server, server.stdout.readline().strip()
+
+
+def main() -> None:
+    """Benchmark every requested stream and print a report."""
+    sys.path.insert(0, str(MOCK_SERVER.parent))
+    from mock_hubspot import add_portal_arguments  # noqa: PLC0415
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_portal_arguments(parser)
+    parser.add_argument("--streams", default="contacts")
+    parser.add_argument("--config", default="{}", help="Tap config, as JSON.")
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--run-stream", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    # Start early enough that every record of the portal is synced.
+    config = {
+        "access_token": "mock-token",
+        "start_date": "2000-01-01T00:00:00Z",
+        **json.loads(args.config),
+    }
+
+    if args.run_stream:
+        result = run_stream(args.run_stream, args.base_url, config)
+        print(json.dumps(result))  # noqa: T201
+        return
+
+    server, base_url = start_mock_server(args)
+    try:
+        print(  # noqa: T201
+            f"Synthetic portal: {args.records:,} records and "
+            f"{args.properties} custom properties per object type",
+        )
+        print(format_row())  # noqa: T201
+        for stream_name in args.streams.split(","):
+            # A process per stream, so each peak RSS is its own.
+            process = subprocess.run(  # noqa: S603
+                [
+                    sys.executable,
+                    __file__,
+                    *sys.argv[1:],
+                    "--base-url",
+                    base_url,
+                    "--run-stream",
+                    stream_name,
+                ],
+                check=False,
+                capture_output=True,
+                text=True,
+            )
+            if process.returncode:
+                sys.stderr.write(process.stderr)
+                sys.exit(f"Syncing {stream_name} failed.")
+            result = json.loads(process.stdout.strip().splitlines()[-1])
+            print(format_row(result))  # noqa: T201
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Micro-benchmark of record extraction from a HubSpot list page.
+
+Compares the SDK's generic jsonpath extraction with the fast path
+`HubspotStream.parse_response` uses for the `$[results][*]` envelope, on a
+synthetic page of 100 contacts.
+
+Run with: `poetry run python benchmarks/bench_parse_response.py`
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+import types
+import typing as t
+
+import requests
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+from tap_hubspot.client import RESULTS_JSONPATH, HubspotStream
+
+PAGE_SIZE = 100
+PROPERTIES_PER_RECORD = 50
+REPEAT = 5
+
+
+def make_page() -> bytes:
+    """Return the body of a synthetic contacts list page."""
+    results = [
+        {
+            "id": str(i),
+            "properties": {
+                f"property_{p}": f"value {i}-{p}" for p in range(PROPERTIES_PER_RECORD)
+            },
+            "createdAt": "2024-01-01T00:00:00.000Z",
+            "updatedAt": "2024-01-02T00:00:00.000Z",
+            "archived": False,
+        }
+        for i in range(PAGE_SIZE)
+    ]
+    page = {"results": results, "paging": {"next": {"after": str(PAGE_SIZE)}}}
+    return json.dumps(page).encode()
+
+
+def make_response(body: bytes) -> requests.Response:
+    """Wrap `body` in a fresh response, so nothing is cached between runs."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body  # noqa: SLF001
+    return response
+
+
+def records_per_second(func: t.Callable[[], list], number: int) -> float:
+    """Return the best records/sec of `func` over a few runs."""
+    best = min(timeit.repeat(func, number=number, repeat=REPEAT))
+    return PAGE_SIZE * number / best
+
+
+def main() -> None:
+    """Print records/sec for each extraction path."""
+    body = make_page()
+    parsed = json.loads(body)
+    stream = types.SimpleNamespace(records_jsonpath=RESULTS_JSONPATH)
+
+    def jsonpath_only() -> list:
+        return list(extract_jsonpath(RESULTS_JSONPATH, input=parsed))
+
+    def fast_path_only() -> list:
+        return list(parsed.get("results") or [])
+
+    def before() -> list:
+        # Previous behaviour: the SDK decoded the page for jsonpath extraction
+        # and get_next_page_token decoded it a second time.
+        response = make_response(body)
+        records = list(extract_jsonpath(RESULTS_JSONPATH, input=response.json()))
+        response.json().get("paging")
+        return records
+
+    def after() -> list:
+        response = make_response(body)
+        return list(HubspotStream.parse_response(stream, response))  # type: ignore[arg-type]
+
+    assert jsonpath_only() == fast_path_only() == before() == after()  # noqa: S101
+
+    number = 200
+    print(f"Synthetic page: {PAGE_SIZE} records, {len(body) / 1024:.0f} KiB")  # noqa: T201
+    for label, func in (
+        ("extract, jsonpath", jsonpath_only),
+        ("extract, fast path", fast_path_only),
+        ("decode + extract, before", before),
+        ("decode + extract, after", after),
+    ):
+        rate = records_per_second(func, number)
+        print(f"{label:<28}{rate:>14,.0f} records/sec")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
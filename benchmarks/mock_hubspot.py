@@ -0,0 +1,490 @@
+"""Local stand-in for the HubSpot API, serving a synthetic portal.
+
+Serves what the tap requests: property definitions, list pages (live and
+archived), search with HubSpot's 10k result cap, batch/read, v4 association
+batch reads and the OAuth token endpoint. Responses carry HubSpot's rate limit
+headers, and requests over the ten-second or search budgets get a 429, like
+the real API. Records are derived from their index rather than stored, so
+portals of millions of records cost no memory.
+
+Run with: `poetry run python benchmarks/mock_hubspot.py --records 100000`
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import json
+import math
+import random
+import threading
+import time
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SEARCH_RESULT_LIMIT = 10000
+PAGE_LIMIT = 100
+SEARCH_PAGE_LIMIT = 200
+BATCH_LIMIT = 100
+ASSOCIATIONS_BATCH_LIMIT = 1000
+DAY_MS = 86_400_000
+DAILY_LIMIT = 1_000_000
+
+# Replication key of each object type, `hs_lastmodifieddate` otherwise.
+REPLICATION_KEYS = {"contacts": "lastmodifieddate"}
+
+
+def _iso(epoch_ms: int) -> str:
+    value = datetime.datetime.fromtimestamp(epoch_ms / 1000, datetime.timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{epoch_ms % 1000:03d}Z"
+
+
+class Portal:
+    """A synthetic HubSpot portal, the same for every object type.
+
+    Record `i` (id `i + 1`) was last modified at `start + (i // per_timestamp)
+    * spacing`, so records are sorted by both id and modification time, and a
+    time range maps to a range of indexes.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        records: int = 10000,
+        *,
+        properties: int = 50,
+        days: int = 365,
+        per_timestamp: int = 1,
+        archived: int = 0,
+        now_ms: int | None = None,
+    ) -> None:
+        """Create a portal.
+
+        Args:
+            records: Live records per object type.
+            properties: Custom string properties per object type.
+            days: Days the modification times of the records are spread over.
+            per_timestamp: Records sharing each modification time.
+            archived: Archived records per object type.
+            now_ms: Time the last record was modified at, in epoch milliseconds.
+        """
+        self.records = records
+        self.per_timestamp = per_timestamp
+        self.archived = archived
+        self.properties = [f"property_{i}" for i in range(properties)]
+        end_ms = now_ms or int(time.time() * 1000)
+        self.start_ms = end_ms - days * DAY_MS
+        buckets = max(math.ceil(records / per_timestamp), 1)
+        self.spacing_ms = max(days * DAY_MS // buckets, 1)
+
+    def modified_ms(self, index: int) -> int:
+        """Return when the record at `index` was last modified."""
+        return self.start_ms + (index // self.per_timestamp) * self.spacing_ms
+
+    def first_index_at(self, epoch_ms: int) -> int:
+        """Return the index of the first record modified at or after `epoch_ms`."""
+        bucket = max(math.ceil((epoch_ms - self.start_ms) / self.spacing_ms), 0)
+        return min(bucket * self.per_timestamp, self.records)
+
+    def definitions(self, object_type: str) -> list[dict[str, t.Any]]:
+        """Return the property definitions of `object_type`."""
+        datetime_property = {"type": "datetime", "fieldType": "date"}
+        definitions = [
+            {"name": "hs_object_id", "type": "number", "fieldType": "number"},
+            {"name": "createdate", **datetime_property},
+            {"name": "hs_lastmodifieddate", **datetime_property},
+            {"name": "amount", "type": "number", "fieldType": "number"},
+            {"name": "is_customer", "type": "bool", "fieldType": "booleancheckbox"},
+        ]
+        key = REPLICATION_KEYS.get(object_type)
+        if key:
+            definitions.append({"name": key, **datetime_property})
+        definitions.extend(
+            {"name": name, "type": "string", "fieldType": "text"}
+            for name in self.properties
+        )
+        return definitions
+
+    def record(
+        self,
+        index: int,
+        properties: t.Iterable[str],
+    ) -> dict[str, t.Any]:
+        """Return the record at `index` with the requested `properties`.
+
+        Indexes past the live records are archived records.
+        """
+        archived = index >= self.records
+        modified = self.modified_ms(index - self.records if archived else index)
+        values = {}
+        for name in properties:
+            if name in {"hs_lastmodifieddate", "lastmodifieddate"}:
+                values[name] = _iso(modified)
+            elif name == "createdate":
+                values[name] = _iso(self.start_ms)
+            elif name == "hs_object_id":
+                values[name] = str(index + 1)
+            elif name == "amount":
+                values[name] = str(index % 1000)
+            elif name == "is_customer":
+                values[name] = "true" if index % 2 else "false"
+            elif name:
+                values[name] = f"value {index}-{name}"
+        record = {
+            "id": str(index + 1),
+            "properties": values,
+            "createdAt": _iso(self.start_ms),
+            "updatedAt": _iso(modified),
+            "archived": archived,
+        }
+        if archived:
+            record["archivedAt"] = _iso(modified + 1)
+        return record
+
+
+class RateLimit:
+    """Sliding-window request budget, as HubSpot enforces per portal."""
+
+    def __init__(self, limit: int, interval: float) -> None:
+        """Allow `limit` requests per `interval` seconds, or any number if 0."""
+        self.limit = limit
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._sent: list[float] = []
+
+    def take(self) -> int | None:
+        """Count a request and return the remaining budget, or None if over."""
+        if not self.limit:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self._sent = [sent for sent in self._sent if sent > now - self.interval]
+            if len(self._sent) >= self.limit:
+                return None
+            self._sent.append(now)
+            return self.limit - len(self._sent)
+
+
+class MockHubspotServer(ThreadingHTTPServer):
+    """HTTP server answering HubSpot API requests from a `Portal`."""
+
+    daemon_threads = True
+
+    def __init__(  # noqa: PLR0913
+        self,
+        portal: Portal,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        *,
+        requests_per_ten_seconds: int = 0,
+        search_requests_per_second: int = 0,
+        error_rate: float = 0.0,
+        latency: float = 0.0,
+        token_ttl: int = 1800,
+    ) -> None:
+        """Create the server; call `serve_forever` to start answering.
+
+        Args:
+            portal: The portal served.
+            address: Host and port to listen on, port 0 picking a free one.
+            requests_per_ten_seconds: Ten-second request budget, 0 for none.
+            search_requests_per_second: Search request budget, 0 for none.
+            error_rate: Share of requests failed with a 429 regardless of budget.
+            latency: Seconds each response is delayed by.
+            token_ttl: Lifetime of the access tokens issued, in seconds. Requests
+                with an expired one get a 401.
+        """
+        super().__init__(address, MockHubspotHandler)
+        self.portal = portal
+        self.ten_secondly = RateLimit(requests_per_ten_seconds, 10)
+        self.secondly_search = RateLimit(search_requests_per_second, 1)
+        self.error_rate = error_rate
+        self.latency = latency
+        self.token_ttl = token_ttl
+        self.requests = 0
+        self.throttled = 0
+        self.tokens_issued = 0
+        # Expiry of the access tokens issued, in monotonic time.
+        self.token_expiry: dict[str, float] = {}
+        self._count_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def count(self, *, throttled: bool = False) -> None:
+        """Count a request."""
+        with self._count_lock:
+            self.requests += 1
+            self.throttled += throttled
+
+
+class MockHubspotHandler(BaseHTTPRequestHandler):
+    """Answers one HubSpot API request."""
+
+    server: MockHubspotServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: t.Any) -> None:  # noqa: A002, D102
+        pass
+
+    def do_GET(self) -> None:  # noqa: D102
+        self._handle("GET")
+
+    def do_POST(self) -> None:  # noqa: D102
+        self._handle("POST")
+
+    def _handle(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+        body: dict[str, t.Any] = {}
+        if "json" in self.headers.get("Content-Type", ""):
+            body = json.loads(data)
+        elif data:
+            body = {key: values[-1] for key, values in parse_qs(data.decode()).items()}
+        parts = url.path.strip("/").split("/")
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if url.path == "/oauth/v1/token":
+            self.server.count()
+            self._token(body)
+            return
+        authorization = self.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            self.server.count()
+            self._send(401, {"status": "error", "category": "INVALID_AUTHENTICATION"})
+            return
+        expiry = self.server.token_expiry.get(authorization[len("Bearer ") :])
+        if expiry is not None and expiry < time.monotonic():
+            self.server.count()
+            self._send(401, {"status": "error", "category": "EXPIRED_AUTHENTICATION"})
+            return
+
+        search = method == "POST" and parts[-1] == "search"
+        remaining = (
+            self.server.secondly_search if search else self.server.ten_secondly
+        ).take()
+        if remaining is None or random.random() < self.server.error_rate:  # noqa: S311
+            self.server.count(throttled=True)
+            self._send(
+                429,
+                {
+                    "status": "error",
+                    "errorType": "RATE_LIMIT",
+                    "policyName": "SECONDLY" if search else "TEN_SECONDLY_ROLLING",
+                },
+                remaining=0,
+            )
+            return
+        self.server.count()
+        status, payload = self._route(method, parts, query, body)
+        self._send(status, payload, remaining=None if search else remaining)
+
+    def _route(
+        self,
+        method: str,
+        parts: list[str],
+        query: dict[str, str],
+        body: dict[str, t.Any],
+    ) -> tuple[int, t.Any]:
+        if method == "GET" and parts[:3] == ["crm", "v3", "properties"]:
+            return 200, {"results": self.server.portal.definitions(parts[-1])}
+        if (
+            method == "GET"
+            and parts[:3] == ["crm", "v3", "objects"]
+            and parts[4:] == []
+        ):
+            return 200, self._list(parts[3], query)
+        if method == "POST" and parts[:3] == ["crm", "v3", "objects"]:
+            if parts[4:] == ["search"]:
+                return self._search(parts[3], body)
+            if parts[4:] == ["batch", "read"]:
+                return 200, self._batch_read(body)
+        if method == "POST" and parts[:3] == ["crm", "v4", "associations"]:
+            return 200, self._associations(body)
+        # Streams the portal holds nothing for, such as owners or pipelines.
+        return 200, {"results": []}
+
+    def _list(self, object_type: str, query: dict[str, str]) -> dict[str, t.Any]:
+        portal = self.server.portal
+        properties = query.get("properties", "").split(",")
+        key = REPLICATION_KEYS.get(object_type, "hs_lastmodifieddate")
+        properties = [name for name in properties if name] or [key]
+        after = int(query.get("after", 0))
+        limit = min(int(query.get("limit", 10)), PAGE_LIMIT)
+        first, end = 0, portal.records
+        if query.get("archived") == "true":
+            first, end = portal.records, portal.records + portal.archived
+        start = first + after
+        stop = min(start + limit, end)
+        page: dict[str, t.Any] = {
+            "results": [portal.record(i, properties) for i in range(start, stop)],
+        }
+        if stop < end:
+            page["paging"] = {"next": {"after": str(stop - first)}}
+        return page
+
+    def _search(self, object_type: str, body: dict[str, t.Any]) -> tuple[int, t.Any]:
+        portal = self.server.portal
+        after = int(body.get("after") or 0)
+        limit = min(int(body.get("limit") or 10), SEARCH_PAGE_LIMIT)
+        if after + limit > SEARCH_RESULT_LIMIT:
+            return 400, {
+                "status": "error",
+                "category": "VALIDATION_ERROR",
+                "message": "Search results are limited to 10000 records.",
+            }
+        start, stop = 0, portal.records
+        for group in body.get("filterGroups") or []:
+            for search_filter in group.get("filters", []):
+                value = int(search_filter["value"])
+                if search_filter["propertyName"] == "hs_object_id":
+                    start = max(start, value)  # Ids are indexes + 1.
+                elif search_filter["operator"] in {"GTE", "GT"}:
+                    start = max(start, portal.first_index_at(value))
+                elif search_filter["operator"] == "LT":
+                    stop = min(stop, portal.first_index_at(value))
+        total = max(stop - start, 0)
+        key = REPLICATION_KEYS.get(object_type, "hs_lastmodifieddate")
+        properties = body.get("properties") or [key]
+        first = start + after
+        last = min(first + limit, stop)
+        page: dict[str, t.Any] = {
+            "total": total,
+            "results": [portal.record(i, properties) for i in range(first, last)],
+        }
+        if last < stop:
+            page["paging"] = {"next": {"after": str(after + limit)}}
+        return 200, page
+
+    def _batch_read(self, body: dict[str, t.Any]) -> dict[str, t.Any]:
+        portal = self.server.portal
+        inputs = body.get("inputs", [])[:BATCH_LIMIT]
+        properties = body.get("properties") or []
+        indexes = [int(item["id"]) - 1 for item in inputs]
+        return {
+            "status": "COMPLETE",
+            "results": [
+                portal.record(i, properties) for i in indexes if 0 <= i < portal.records
+            ],
+        }
+
+    def _associations(self, body: dict[str, t.Any]) -> dict[str, t.Any]:
+        inputs = body.get("inputs", [])[:ASSOCIATIONS_BATCH_LIMIT]
+        association_type = {"category": "HUBSPOT_DEFINED", "typeId": 1, "label": None}
+        return {
+            "status": "COMPLETE",
+            "results": [
+                {
+                    "from": {"id": item["id"]},
+                    "to": [
+                        {
+                            "toObjectId": int(item["id"]) + offset,
+                            "associationTypes": [association_type],
+                        }
+                        for offset in (1, 2)
+                    ],
+                }
+                for item in inputs
+            ],
+        }
+
+    def _token(self, form: dict[str, t.Any]) -> None:
+        if "refresh_token" not in form:
+            self._send(400, {"status": "BAD_REFRESH_TOKEN"})
+            return
+        self.server.tokens_issued += 1
+        access_token = f"mock-token-{self.server.tokens_issued}"
+        expiry = time.monotonic() + self.server.token_ttl
+        self.server.token_expiry[access_token] = expiry
+        self._send(
+            200,
+            {
+                "access_token": access_token,
+                "refresh_token": "mock-refresh-token",
+                "expires_in": self.server.token_ttl,
+                "token_type": "bearer",
+            },
+        )
+
+    def _send(
+        self,
+        status: int,
+        payload: t.Any,  # noqa: ANN401
+        remaining: int | None = None,
+    ) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        limit = self.server.ten_secondly.limit
+        if remaining is not None and limit:
+            # Search responses carry no rate limit headers on HubSpot either.
+            self.send_header("X-HubSpot-RateLimit-Max", str(limit))
+            self.send_header("X-HubSpot-RateLimit-Remaining", str(remaining))
+            self.send_header("X-HubSpot-RateLimit-Interval-Milliseconds", "10000")
+            self.send_header("X-HubSpot-RateLimit-Daily", str(DAILY_LIMIT))
+            self.send_header(
+                "X-HubSpot-RateLimit-Daily-Remaining",
+                str(DAILY_LIMIT - self.server.requests),
+            )
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def add_portal_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options describing the portal and the server to `parser`."""
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--properties", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--per-timestamp", type=int, default=1)
+    parser.add_argument("--archived", type=int, default=0)
+    parser.add_argument("--requests-per-ten-seconds", type=int, default=0)
+    parser.add_argument("--search-requests-per-second", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=int, default=1800)
+
+
+def server_from_arguments(
+    args: argparse.Namespace,
+    address: tuple[str, int] = ("127.0.0.1", 0),
+) -> MockHubspotServer:
+    """Create a server from the options of `add_portal_arguments`."""
+    portal = Portal(
+        records=args.records,
+        properties=args.properties,
+        days=args.days,
+        per_timestamp=args.per_timestamp,
+        archived=args.archived,
+    )
+    return MockHubspotServer(
+        portal,
+        address,
+        requests_per_ten_seconds=args.requests_per_ten_seconds,
+        search_requests_per_second=args.search_requests_per_second,
+        error_rate=args.error_rate,
+        latency=args.latency,
+        token_ttl=args.token_ttl,
+    )
+
+
+def main() -> None:
+    """Serve a synthetic portal until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_portal_arguments(parser)
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+    server = server_from_arguments(args, ("127.0.0.1", args.port))
+    print(server.url, flush=True)  # noqa: T201
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
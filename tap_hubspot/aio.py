@@ -0,0 +1,152 @@
+"""Asyncio request engine shared by every stream of a tap run."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+if t.TYPE_CHECKING:
+    import requests
+
+    from tap_hubspot.ratelimit import HubspotRateLimiter
+
+T = t.TypeVar("T")
+
+DEFAULT_MAX_REQUESTS_IN_FLIGHT = 10
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+class AsyncRequestEngine:
+    """Sends HubSpot requests from one event loop, with a global in-flight cap.
+
+    The loop runs on a daemon thread, so synchronous stream code can submit
+    coroutines to it and consume their results. Waiting for the rate limiter
+    and for free request slots never ties up a thread: only requests actually
+    on the wire do, on a pool sized to the in-flight cap, since the pooled
+    `requests` session is the transport.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        rate_limiter: HubspotRateLimiter,
+        max_in_flight: int = DEFAULT_MAX_REQUESTS_IN_FLIGHT,
+    ) -> None:
+        """Start the engine.
+
+        Args:
+            session: Session sending the requests.
+            rate_limiter: Rate limiter budgeting the requests.
+            max_in_flight: Maximum number of requests awaiting a response.
+        """
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight,
+            thread_name_prefix="hubspot-http",
+        )
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="hubspot-aio",
+            daemon=True,
+        )
+        self._thread.start()
+        self._in_flight = self.run(self._make_semaphore(max_in_flight))
+
+    @staticmethod
+    async def _make_semaphore(value: int) -> asyncio.Semaphore:
+        # Before Python 3.10, asyncio primitives bind to the loop they are
+        # created on.
+        return asyncio.Semaphore(value)
+
+    def run(self, coro: t.Coroutine[t.Any, t.Any, T]) -> T:
+        """Run `coro` on the engine's loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def send(
+        self,
+        prepared_request: requests.PreparedRequest,
+        auth: t.Callable[[requests.PreparedRequest], requests.PreparedRequest],
+        **kwargs: t.Any,
+    ) -> requests.Response:
+        """Send a request once the rate limiter and the in-flight cap allow it.
+
+        Args:
+            prepared_request: The request to send.
+            auth: Authenticator, applied right before sending so a token
+                refreshed since the request was prepared is used.
+            **kwargs: Keyword arguments for :meth:`requests.Session.send`.
+
+        Returns:
+            The response.
+        """
+        delay = self.rate_limiter.bucket_for(prepared_request.url).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        def send() -> requests.Response:
+            # Token refreshes block, so they happen here and not on the loop.
+            return self.session.send(auth(prepared_request), **kwargs)
+
+        async with self._in_flight:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, send)
+
+    def iterate(
+        self,
+        items: t.AsyncIterator[T],
+        buffer_size: int,
+    ) -> t.Iterator[T]:
+        """Consume an async iterator from synchronous code.
+
+        The iterator runs ahead on the engine's loop, buffering at most
+        `buffer_size` items. An exception it raises is re-raised in the
+        consumer, and closing the returned generator cancels it.
+
+        Args:
+            items: The async iterator to consume.
+            buffer_size: Maximum number of items buffered ahead of the consumer.
+
+        Yields:
+            Every item of `items`, in order.
+        """
+        buffer: asyncio.Queue = self.run(self._make_queue(buffer_size))
+        task = asyncio.run_coroutine_threadsafe(self._fill(items, buffer), self._loop)
+        try:
+            while (item := self.run(buffer.get())) is not _DONE:
+                if isinstance(item, _Failure):
+                    raise item.exc
+                yield item
+        finally:
+            task.cancel()
+
+    @staticmethod
+    async def _make_queue(maxsize: int) -> asyncio.Queue:
+        return asyncio.Queue(maxsize=maxsize)
+
+    @staticmethod
+    async def _fill(items: t.AsyncIterator[t.Any], buffer: asyncio.Queue) -> None:
+        try:
+            async for item in items:
+                await buffer.put(item)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:  # noqa: BLE001
+            await buffer.put(_Failure(exc))
+        else:
+            await buffer.put(_DONE)
+
+    def close(self) -> None:
+        """Stop the loop and release the worker threads."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._executor.shutdown(wait=True)
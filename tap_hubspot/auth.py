@@ -1,16 +1,258 @@
 """HubSpot Authentication."""
 
-from singer_sdk.authenticators import OAuthAuthenticator, SingletonMeta
+from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import typing as t
+from pathlib import Path
 
-class HubSpotOAuthAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
-    """Authenticator class for HubSpot."""
+import requests
+from singer_sdk.authenticators import OAuthAuthenticator
+
+if t.TYPE_CHECKING:
+    from singer_sdk.streams.rest import _HTTPStream
+
+logger = logging.getLogger(__name__)
+
+OAUTH_TOKEN_URL = "https://api.hubapi.com/oauth/v1/token"  # noqa: S105
+# Refresh this long before an access token expires. HubSpot's last 30 minutes.
+DEFAULT_TOKEN_REFRESH_MARGIN = 5 * 60
+
+
+class AccessToken(t.NamedTuple):
+    """An OAuth access token, with when to refresh it and when it expires.
+
+    Both times are in epoch seconds.
+    """
+
+    value: str
+    refresh_at: float
+    expires_at: float
+
+    @classmethod
+    def issued(
+        cls,
+        value: str,
+        issued_at: float,
+        expires_in: float,
+        refresh_margin: float,
+    ) -> AccessToken:
+        """Return a token issued at `issued_at`, valid for `expires_in` seconds.
+
+        It is due for a refresh `refresh_margin` seconds before it expires, or
+        halfway through its lifetime for short-lived tokens.
+        """
+        refresh_in = max(expires_in - refresh_margin, expires_in / 2)
+        return cls(value, issued_at + refresh_in, issued_at + expires_in)
+
+    @property
+    def refresh_due(self) -> bool:
+        """Whether the token should be refreshed."""
+        return time.time() >= self.refresh_at
 
     @property
-    def oauth_request_body(self):  # noqa: ANN201, D102
+    def valid(self) -> bool:
+        """Whether the token has not expired yet."""
+        return time.time() < self.expires_at
+
+
+class OAuthTokenManager:
+    """Access tokens shared by every stream of a tap run.
+
+    One refresh runs at a time. Once a token is within `refresh_margin` of its
+    expiry, the first caller refreshes it while the others keep using it; only
+    callers without a valid token wait for the refresh in flight.
+    """
+
+    def __init__(
+        self,
+        config: t.Mapping[str, t.Any],
+        session: requests.Session,
+        *,
+        auth_endpoint: str = OAUTH_TOKEN_URL,
+        refresh_margin: float = DEFAULT_TOKEN_REFRESH_MARGIN,
+        cache_path: str | None = None,
+    ) -> None:
+        """Create the manager.
+
+        Args:
+            config: The tap config, with the OAuth app credentials.
+            session: Session the token requests are sent with.
+            auth_endpoint: The OAuth token endpoint.
+            refresh_margin: Seconds before its expiry a token is refreshed.
+            cache_path: File to cache the access token in between runs.
+        """
+        self.config = config
+        self.session = session
+        self.auth_endpoint = auth_endpoint
+        self.refresh_margin = refresh_margin
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._lock = threading.Lock()
+        self._token: AccessToken | None = None
+        self.refreshes = 0
+
+    @property
+    def request_body(self) -> dict[str, str]:
+        """Return the form of the token refresh request."""
         return {
             "grant_type": "refresh_token",
             "client_id": self.config["client_id"],
             "client_secret": self.config["client_secret"],
             "refresh_token": self.config["refresh_token"],
         }
+
+    def access_token(self) -> str:
+        """Return a valid access token, refreshing it when due."""
+        token = self._token
+        if token is not None and not token.refresh_due:
+            return token.value
+
+        if token is not None and token.valid:
+            # Refresh ahead of expiry, unless another thread already is.
+            if not self._lock.acquire(blocking=False):
+                return token.value
+            try:
+                return self._refreshed_token().value
+            finally:
+                self._lock.release()
+
+        with self._lock:
+            return self._refreshed_token().value
+
+    def reject(self, value: str) -> None:
+        """Mark token `value` as expired after HubSpot refused it.
+
+        Only the first of the requests refused with the same token causes a
+        refresh; the others get the token it fetched.
+        """
+        with self._lock:
+            if self._token is not None and self._token.value == value:
+                self._token = AccessToken(value, refresh_at=0, expires_at=0)
+                self._forget_cached()
+
+    def _refreshed_token(self) -> AccessToken:
+        """Return the current token, refreshing it first when due.
+
+        Called with the lock held, so the refreshes are never concurrent.
+        """
+        if self._token is None:
+            self._token = self._load_cached()
+        if self._token is None or self._token.refresh_due:
+            self._token = self._request_token()
+            self._store_cached(self._token)
+        return self._token
+
+    def _request_token(self) -> AccessToken:
+        requested_at = time.time()
+        response = self.session.post(
+            self.auth_endpoint,
+            data=self.request_body,
+            timeout=60,
+        )
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as ex:
+            msg = f"Failed OAuth login, response was '{response.text}'. {ex}"
+            raise RuntimeError(msg) from ex
+
+        token_json = response.json()
+        self.refreshes += 1
+        logger.info("OAuth authorization attempt was successful.")
+        return AccessToken.issued(
+            token_json["access_token"],
+            requested_at,
+            int(token_json["expires_in"]),
+            self.refresh_margin,
+        )
+
+    # The cached token is only used by runs of the same app and refresh token,
+    # which are identified by a hash so neither is written to disk.
+
+    @property
+    def _cache_key(self) -> str:
+        credentials = f"{self.config['client_id']}:{self.config['refresh_token']}"
+        return hashlib.sha256(credentials.encode()).hexdigest()
+
+    def _load_cached(self) -> AccessToken | None:
+        if not self.cache_path or not self.cache_path.exists():
+            return None
+        try:
+            entry = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable token cache file %s", self.cache_path)
+            return None
+        if entry.get("key") != self._cache_key:
+            return None
+        token = AccessToken(
+            entry["access_token"],
+            refresh_at=entry["refresh_at"],
+            expires_at=entry["expires_at"],
+        )
+        return None if token.refresh_due else token
+
+    def _store_cached(self, token: AccessToken) -> None:
+        if not self.cache_path:
+            return
+        entry = {
+            "key": self._cache_key,
+            "access_token": token.value,
+            "refresh_at": token.refresh_at,
+            "expires_at": token.expires_at,
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # mkstemp creates the file readable by its owner only.
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as tmp:
+                json.dump(entry, tmp)
+            Path(tmp_name).replace(self.cache_path)
+        except OSError:
+            logger.warning("Could not write token cache file %s", self.cache_path)
+
+    def _forget_cached(self) -> None:
+        if self.cache_path:
+            self.cache_path.unlink(missing_ok=True)
+
+
+class HubSpotOAuthAuthenticator(OAuthAuthenticator):
+    """Authenticator class for HubSpot, using the tap's shared access tokens."""
+
+    def __init__(
+        self,
+        stream: _HTTPStream,
+        token_manager: OAuthTokenManager,
+    ) -> None:
+        """Create an authenticator for `stream`.
+
+        Args:
+            stream: The stream instance to use with this authenticator.
+            token_manager: Provides the access tokens.
+        """
+        super().__init__(stream, auth_endpoint=token_manager.auth_endpoint)
+        self.token_manager = token_manager
+
+    @property
+    def oauth_request_body(self) -> dict:
+        """Return the form of the token refresh request."""
+        return self.token_manager.request_body
+
+    def authenticate_request(
+        self,
+        request: requests.PreparedRequest,
+    ) -> requests.PreparedRequest:
+        """Authenticate `request` with the current access token.
+
+        Args:
+            request: A :class:`requests.PreparedRequest` object.
+
+        Returns:
+            The authenticated request object.
+        """
+        request.headers["Authorization"] = f"Bearer {self.token_manager.access_token()}"
+        return request
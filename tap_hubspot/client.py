@@ -2,24 +2,48 @@
 
 from __future__ import annotations
 
+import contextlib
 import datetime
+import decimal
+import functools
+import itertools
+import json
+import math
 import sys
+import time
 import typing as t
 from functools import cached_property
+from http import HTTPStatus
+from urllib.parse import quote
 
 import requests
+from singer_sdk import metrics
 from singer_sdk import typing as th
+from singer_sdk._singerlib import RecordMessage
 from singer_sdk._singerlib.utils import strptime_to_utc
 from singer_sdk.authenticators import BearerTokenAuthenticator
+from singer_sdk.exceptions import RetriableAPIError
+from singer_sdk.helpers._typing import TypeConformanceLevel, _warn_unmapped_properties
+from singer_sdk.helpers._util import utc_now
+from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.streams import RESTStream
 from singer_sdk.streams.core import REPLICATION_INCREMENTAL
 
 from tap_hubspot.auth import HubSpotOAuthAuthenticator
+from tap_hubspot.concurrency import iter_ahead, iter_in_order, map_in_order
+from tap_hubspot.conform import RecordConformer
+from tap_hubspot.properties import compile_coercers, property_datatype
 
 if t.TYPE_CHECKING:
     from singer_sdk.helpers.types import Context
     from singer_sdk.pagination import BaseAPIPaginator
 
+    from tap_hubspot.aio import AsyncRequestEngine
+    from tap_hubspot.instrumentation import StreamMetrics
+    from tap_hubspot.profiling import StreamProfiler
+    from tap_hubspot.properties import Coercer
+    from tap_hubspot.ratelimit import HubspotRateLimiter
+
 if sys.version_info < (3, 11):
     from backports.datetime_fromisoformat import MonkeyPatch
 
@@ -27,10 +51,120 @@ if sys.version_info < (3, 11):
 
 _Auth = t.Callable[[requests.PreparedRequest], requests.PreparedRequest]
 
+# The `{"results": [...], "paging": {...}}` envelope most endpoints return.
+RESULTS_JSONPATH = "$[results][*]"
+
+# State key holding the latest `archivedAt` of the archived records synced.
+ARCHIVED_BOOKMARK_KEY = "archived_at"
+# Context of the list requests for archived records.
+ARCHIVED_CONTEXT: dict[str, t.Any] = {"archived": True}
+DEFAULT_CHECKPOINT_INTERVAL_RECORDS = 10000
+DEFAULT_CHECKPOINT_INTERVAL_SECONDS = 300
+
+# https://developers.hubspot.com/docs/api/crm/search#limitations
+SEARCH_RESULT_LIMIT = 10000
+SEARCH_PAGE_SIZE = 100
+# https://developers.hubspot.com/docs/api/crm/understanding-the-crm#batch-endpoints
+BATCH_READ_SIZE = 100
+# Longest encoded `properties` query parameter sent on GET requests. Longer
+# lists are split into groups, keeping URLs well below common proxy limits.
+MAX_PROPERTIES_PARAM_LENGTH = 4000
+# https://developers.hubspot.com/docs/api/crm/associations#batch-read-associations
+ASSOCIATIONS_BATCH_SIZE = 1000
+ASSOCIATIONS_PAGE_SIZE = 500
+
+
+def _epoch_ms(value: datetime.datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+class SearchWindow(dict):
+    """Context of a search time window, with the state to page through it.
+
+    The dict holds what the requests are built from: the window bounds, the
+    replication key value of the last record received (`cursor`) and, when
+    paging through a single crowded millisecond by record id, `after_id`.
+    """
+
+    def __init__(self, start_ms: int, end_ms: int) -> None:
+        """Create a window covering `[start_ms, end_ms)`.
+
+        Args:
+            start_ms: Inclusive lower bound, in epoch milliseconds.
+            end_ms: Exclusive upper bound, in epoch milliseconds.
+        """
+        super().__init__(window_start=start_ms, window_end=end_ms)
+        # Ids received with the replication key value `cursor`. Restarting at
+        # the cursor returns these again, so they are skipped.
+        self.cursor_ids: set[str] = set()
+        # The remainder of the window, once a crowded millisecond was split off.
+        self.next: SearchWindow | None = None
+
+
+class AssociationBatch(dict):
+    """Context of a batch of parent records whose associations are read.
+
+    The ids are kept out of the dict, which ends up in logs and metrics.
+    """
+
+    def __init__(self, number: int, object_ids: list[str]) -> None:
+        """Create the `number`-th batch of a parent stream sync.
+
+        Args:
+            number: Sequence number of the batch, from 1.
+            object_ids: Ids of the parent records.
+        """
+        super().__init__(batch=number, size=len(object_ids))
+        self.object_ids = object_ids
+
+
+def _is_archived(context: Context | None) -> bool:
+    return bool(context and context.get("archived"))
+
+
+def _stdlib_loads(content: bytes) -> t.Any:  # noqa: ANN401
+    return json.loads(content, parse_float=decimal.Decimal)
+
+
+# Decoding response bodies dominates CPU time on large streams, so use msgspec
+# when it is installed. Either way non-integer numbers decode as Decimals, like
+# the SDK decodes them; orjson can only decode them as floats, so is not used.
+_loads: t.Callable[[bytes], t.Any]
+try:
+    from msgspec.json import Decoder
+
+    _loads = Decoder(float_hook=decimal.Decimal).decode
+except (ImportError, TypeError):
+    # Before msgspec 0.15, decoders take no float_hook.
+    _loads = _stdlib_loads
+
+_PARSED_ATTR = "_hubspot_json"
+
+
+def response_json(response: requests.Response) -> t.Any:  # noqa: ANN401
+    """Return the decoded body of `response`, decoding it only once.
+
+    Args:
+        response: A :class:`requests.Response` object.
+
+    Returns:
+        The decoded JSON body.
+    """
+    try:
+        return getattr(response, _PARSED_ATTR)
+    except AttributeError:
+        parsed = _loads(response.content)
+        setattr(response, _PARSED_ATTR, parsed)
+        return parsed
+
 
 class HubspotStream(RESTStream):
     """tap-hubspot stream class."""
 
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:  # noqa: D107
+        self._conformer: RecordConformer | None = None
+        super().__init__(*args, **kwargs)
+
     @property
     def url_base(self) -> str:
         """Returns base url."""
@@ -51,7 +185,7 @@ class HubspotStream(RESTStream):
         if "refresh_token" in self.config:
             return HubSpotOAuthAuthenticator(
                 self,
-                auth_endpoint="https://api.hubapi.com/oauth/v1/token",
+                self._tap.oauth_token_manager,  # type: ignore[attr-defined]
             )
         return BearerTokenAuthenticator(
             self,
@@ -70,6 +204,393 @@ class HubspotStream(RESTStream):
             headers["User-Agent"] = self.config.get("user_agent")
         return headers
 
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the pooled HTTP session shared by every stream of the tap."""
+        return self._tap.http_session  # type: ignore[attr-defined]
+
+    def build_prepared_request(
+        self,
+        *args: t.Any,
+        **kwargs: t.Any,
+    ) -> requests.PreparedRequest:
+        """Build a request without touching the shared session.
+
+        Requests are authenticated right before being sent instead: async
+        requests are prepared on the event loop, where a token refresh would
+        stall every stream.
+
+        Args:
+            *args: Arguments to pass to :class:`requests.Request`.
+            **kwargs: Keyword arguments to pass to :class:`requests.Request`.
+
+        Returns:
+            A :class:`requests.PreparedRequest` object.
+        """
+        return self.requests_session.prepare_request(requests.Request(*args, **kwargs))
+
+    @property
+    def rate_limiter(self) -> HubspotRateLimiter:
+        """Return the rate limiter shared by every stream of the tap."""
+        return self._tap.rate_limiter  # type: ignore[attr-defined]
+
+    @property
+    def http_engine(self) -> AsyncRequestEngine | None:
+        """Return the tap's asyncio request engine, or None when not enabled."""
+        return self._tap.http_engine  # type: ignore[attr-defined]
+
+    @cached_property
+    def stream_metrics(self) -> StreamMetrics:
+        """Return the measurements of this stream's sync."""
+        return self._tap.metrics_registry.stream(self.name)  # type: ignore[attr-defined]
+
+    @cached_property
+    def stream_profiler(self) -> StreamProfiler | None:
+        """Return the profiler of this stream, or None unless profiling."""
+        registry = self._tap.profiler_registry  # type: ignore[attr-defined]
+        return registry.stream(self.name) if registry else None
+
+    def _profiled(self) -> contextlib.AbstractContextManager[None]:
+        """Return a context manager profiling its block when profiling."""
+        profiler = self.stream_profiler
+        return profiler.session() if profiler else contextlib.nullcontext()
+
+    def _sync_records(
+        self,
+        context: Context | None = None,
+        *,
+        write_messages: bool = True,
+    ) -> t.Generator[dict, t.Any, t.Any]:
+        # Records are consumed as they are synced, in this same thread.
+        with self._profiled():
+            yield from super()._sync_records(context, write_messages=write_messages)
+
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: Context | None,
+    ) -> requests.Response:
+        if engine := self.http_engine:
+            return engine.run(self._request_async(prepared_request, context))
+        with self.stream_metrics.time("rate_limit_wait"):
+            self.rate_limiter.acquire(prepared_request.url)
+        # Authenticate right before sending, so a token refreshed since the
+        # request was prepared, or after it was refused, is used.
+        prepared_request = self.authenticator(prepared_request)
+        with self.stream_metrics.time("network"), self._profiled():
+            return super()._request(prepared_request, context)
+
+    async def _request_async(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: Context | None,
+    ) -> requests.Response:
+        # The engine waits for the rate limiter too, so that is network time.
+        with self.stream_metrics.time("network"):
+            response = await self.http_engine.send(  # type: ignore[union-attr]
+                prepared_request,
+                self.authenticator,
+                timeout=self.timeout,
+                allow_redirects=self.allow_redirects,
+            )
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags=None,
+        )
+        self.validate_response(response)
+        return response
+
+    def request_records(self, context: Context | None) -> t.Iterable[dict]:
+        """Request records from REST endpoint(s), returning response records.
+
+        With `prefetch_pages` set, the next page is requested as soon as the
+        cursor to it is known, up to that many pages ahead of the records
+        being processed. With `async_http` enabled, pages are requested on the
+        tap's event loop, and always at least one page ahead.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            An item for every record in the response.
+        """
+        prefetch = self.config.get("prefetch_pages") or 0
+        pages: t.Iterable[list[dict]]
+        if engine := self.http_engine:
+            pages = engine.iterate(self._aiter_pages(context), max(prefetch, 1))
+        elif prefetch > 0:
+            pages = iter_ahead(functools.partial(self._iter_pages, context), prefetch)
+        else:
+            pages = self._iter_pages(context)
+        for page in pages:
+            yield from page
+
+    def _iter_pages(self, context: Context | None) -> t.Iterator[list[dict]]:
+        """Request every page of records, as the SDK's `request_records` does."""
+        paginator = self.get_new_paginator()
+        decorated_request = self.request_decorator(self._request)
+        pages = 0
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+
+            while not paginator.finished:
+                prepared_request = self.prepare_request(
+                    context,
+                    next_page_token=paginator.current_value,
+                )
+                resp = decorated_request(prepared_request, context)
+                request_counter.increment()
+                page = self._read_page(prepared_request, resp, context)
+                if not page:
+                    self._log_empty_page(pages)
+                    break
+                yield self._page_received(page, context)
+                pages += 1
+                if self._reached_end_date(page):
+                    self._log_end_date_reached(pages)
+                    break
+
+                paginator.advance(resp)
+
+    async def _aiter_pages(
+        self,
+        context: Context | None,
+    ) -> t.AsyncIterator[list[dict]]:
+        """Request every page of records on the event loop of the tap."""
+        paginator = self.get_new_paginator()
+        decorated_request = self.request_decorator(self._request_async)
+        pages = 0
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+
+            while not paginator.finished:
+                prepared_request = self.prepare_request(
+                    context,
+                    next_page_token=paginator.current_value,
+                )
+                resp = await decorated_request(prepared_request, context)
+                request_counter.increment()
+                page = self._read_page(prepared_request, resp, context)
+                if not page:
+                    self._log_empty_page(pages)
+                    break
+                yield self._page_received(page, context)
+                pages += 1
+                if self._reached_end_date(page):
+                    self._log_end_date_reached(pages)
+                    break
+
+                paginator.advance(resp)
+
+    def _read_page(
+        self,
+        prepared_request: requests.PreparedRequest,
+        response: requests.Response,
+        context: Context | None,
+    ) -> list[dict]:
+        self.update_sync_costs(prepared_request, response, context)
+        with self.stream_metrics.time("parse"), self._profiled():
+            page = list(self.parse_response(response))
+        self.stream_metrics.increment("pages")
+        return page
+
+    def _page_received(self, page: list[dict], context: Context | None) -> list[dict]:  # noqa: ARG002
+        """Hook called with each page, before the next is requested.
+
+        Returns:
+            The records of the page to emit: those replicated before `end_date`.
+        """
+        if self._end_date is None:
+            return page
+        return [record for record in page if not self._is_past_end_date(record)]
+
+    @cached_property
+    def _end_date(self) -> datetime.datetime | None:
+        end_date = self.config.get("end_date")
+        if not end_date or not self.replication_key:
+            return None
+        return strptime_to_utc(end_date)
+
+    def _is_past_end_date(self, record: dict) -> bool:
+        """Whether `record` was replicated at or after `end_date`."""
+        value = record.get(self.replication_key)
+        if value is None:
+            value = (record.get("properties") or {}).get(self.replication_key)
+        if isinstance(value, str):
+            value = strptime_to_utc(value)
+        end_date = self._end_date
+        return (
+            end_date is not None
+            and isinstance(value, datetime.datetime)
+            and value >= end_date
+        )
+
+    def _reached_end_date(self, page: list[dict]) -> bool:
+        """Whether no page after `page` holds records before `end_date`."""
+        return (
+            self.is_sorted
+            and self._end_date is not None
+            and self._is_past_end_date(page[-1])
+        )
+
+    def _log_empty_page(self, pages: int) -> None:
+        self.logger.info(
+            "Pagination stopped after %d pages because no records were "
+            "found in the last response",
+            pages,
+        )
+
+    def _log_end_date_reached(self, pages: int) -> None:
+        self.logger.info(
+            "Pagination stopped after %d pages because the last response "
+            "reached the end date",
+            pages,
+        )
+
+    def validate_response(self, response: requests.Response) -> None:
+        """Measure the response and calibrate the rate limiter, then validate it.
+
+        Args:
+            response: A :class:`requests.Response` object.
+        """
+        self.stream_metrics.observe_response(response)
+        self.rate_limiter.update(response)
+        if response.status_code == HTTPStatus.UNAUTHORIZED and isinstance(
+            self.authenticator,
+            HubSpotOAuthAuthenticator,
+        ):
+            # The access token expired or was revoked early. Every request it
+            # was refused for is retried with the one refresh that follows.
+            authorization = response.request.headers.get("Authorization", "")
+            self.authenticator.token_manager.reject(
+                authorization.removeprefix("Bearer "),
+            )
+            raise RetriableAPIError(self.response_error_message(response), response)
+        super().validate_response(response)
+
+    # The tap may sync several streams at once, so every write to the shared
+    # state dict goes through the tap's message lock.
+
+    def _increment_stream_state(
+        self,
+        latest_record: dict[str, t.Any],
+        *,
+        context: Context | None = None,
+    ) -> None:
+        with self._tap.message_lock:  # type: ignore[attr-defined]
+            super()._increment_stream_state(latest_record, context=context)
+
+    def _finalize_state(self, state: dict | None = None) -> None:
+        with self._tap.message_lock:  # type: ignore[attr-defined]
+            super()._finalize_state(state)
+
+    def _write_state_message(self) -> None:
+        # The state dict is deep-copied while other streams may be updating it.
+        with self._tap.message_lock:  # type: ignore[attr-defined]
+            super()._write_state_message()
+
+    def _write_starting_replication_value(self, context: Context | None) -> None:
+        with self._tap.message_lock:  # type: ignore[attr-defined]
+            super()._write_starting_replication_value(context)
+
+    def _write_replication_key_signpost(
+        self,
+        context: Context | None,
+        value: datetime.datetime | str | float,
+    ) -> None:
+        with self._tap.message_lock:  # type: ignore[attr-defined]
+            super()._write_replication_key_signpost(context, value)
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
+        """Return a generator of record-type dictionary objects.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            One item per (possibly processed) record in the API.
+        """
+        for record in self.request_records(context):
+            transformed_record = self._timed_post_process(record, context)
+            if transformed_record is not None:
+                yield transformed_record
+
+    def _timed_post_process(
+        self,
+        record: dict,
+        context: Context | None,
+    ) -> dict | None:
+        started = time.perf_counter()
+        with self._profiled():
+            transformed_record = self.post_process(record, context)
+        self.stream_metrics.add_time("post_process", time.perf_counter() - started)
+        return transformed_record
+
+    def _write_record_message(self, record: dict[str, t.Any]) -> None:
+        stream_metrics = self.stream_metrics
+        started = time.perf_counter()
+        record_messages = list(self._generate_record_messages(record))
+        conformed = time.perf_counter()
+        for record_message in record_messages:
+            self._tap.write_message(record_message)
+        stream_metrics.add_time("conform", conformed - started)
+        stream_metrics.add_time("write", time.perf_counter() - conformed)
+        stream_metrics.increment("records")
+        self._is_state_flushed = False
+        self._tap.metrics_registry.report_if_due(self.name)  # type: ignore[attr-defined]
+
+    @property
+    def fast_record_conformance(self) -> bool:
+        """Whether records are conformed by a conformer compiled from the schema."""
+        return bool(self.config.get("fast_record_conformance")) and (
+            self.TYPE_CONFORMANCE_LEVEL == TypeConformanceLevel.RECURSIVE
+        )
+
+    def _generate_record_messages(
+        self,
+        record: dict[str, t.Any],
+    ) -> t.Generator[RecordMessage, None, None]:
+        if not self.fast_record_conformance:
+            yield from super()._generate_record_messages(record)
+            return
+
+        if self._conformer is None:
+            self._conformer = RecordConformer(self.schema, self.mask)
+        record, unmapped = self._conformer(record)
+        if unmapped:
+            _warn_unmapped_properties(self.name, tuple(unmapped), self.logger)
+        for stream_map in self.stream_maps:
+            mapped_record = stream_map.transform(record)
+            # Emit record if not filtered
+            if mapped_record is not None:
+                yield RecordMessage(
+                    stream=stream_map.stream_alias,
+                    record=mapped_record,
+                    version=None,
+                    time_extracted=utc_now(),
+                )
+
+    def parse_response(self, response: requests.Response) -> t.Iterable[dict]:
+        """Parse the response and return an iterator of result records.
+
+        Args:
+            response: A raw :class:`requests.Response`
+
+        Yields:
+            One item for every item found in the response.
+        """
+        data = response_json(response)
+        if self.records_jsonpath == RESULTS_JSONPATH:
+            # HubSpot's standard envelope; iterating the list directly skips
+            # the generic jsonpath engine on every page.
+            yield from data.get("results") or []
+            return
+        yield from extract_jsonpath(self.records_jsonpath, input=data)
+
     def get_new_paginator(self) -> BaseAPIPaginator:
         """Create a new pagination helper instance.
 
@@ -94,7 +615,7 @@ class HubspotStream(RESTStream):
         # If pagination is required, return a token which can be used to get the
         #       next page. If this is the final page, return "None" to end the
         #       pagination loop.
-        resp_json = response.json()
+        resp_json = response_json(response)
         paging = resp_json.get("paging")
 
         if paging is not None:
@@ -130,21 +651,43 @@ class HubspotStream(RESTStream):
 class DynamicHubspotStream(HubspotStream):
     """DynamicHubspotStream."""
 
+    # Properties requested from HubSpot, or None for all of them.
+    included_properties: t.ClassVar[tuple[str, ...] | None] = None
+    # Properties never requested from HubSpot.
+    excluded_properties: t.ClassVar[tuple[str, ...]] = ()
+
     def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:  # noqa: D107
+        self._dynamic_schema: dict | None = None
+        self._coercers: dict[str, Coercer] | None = None
+        self._child_ids: list[str] = []
+        self._child_batches = 0
         super().__init__(*args, **kwargs)
 
-    def _get_datatype(self, data_type: str) -> th.JSONTypeHelper:  # noqa: ARG002
-        # TODO: consider typing more precisely  # noqa: TD002, TD003, FIX002
-        return th.StringType()
+    @property
+    def typed_properties(self) -> bool:
+        """Whether properties are typed after their HubSpot definition."""
+        return self.config.get("typed_properties", False)
 
-    @cached_property
+    def _get_datatype(self, definition: dict[str, t.Any]) -> th.JSONTypeHelper:
+        if not self.typed_properties:
+            return th.StringType()
+        return property_datatype(definition)
+
+    @property
     def schema(self) -> dict:
         """Return a draft JSON schema for this stream."""
+        # Not a cached_property: before Python 3.12 its lock is shared by every
+        # instance, which would serialise property discovery across streams.
+        if self._dynamic_schema is None:
+            self._dynamic_schema = self._get_schema()
+        return self._dynamic_schema
+
+    def _get_schema(self) -> dict:
         hs_props = []
         self.hs_properties = self._get_available_properties()
-        for name, prop_type in self.hs_properties.items():
+        for name, definition in self.hs_properties.items():
             hs_props.append(
-                th.Property(name, self._get_datatype(prop_type)),
+                th.Property(name, self._get_datatype(definition)),
             )
         schema = th.PropertiesList(
             th.Property("id", th.StringType),
@@ -158,16 +701,80 @@ class DynamicHubspotStream(HubspotStream):
         )
         return schema.to_dict()
 
-    def _get_available_properties(self) -> dict[str, str]:
-        session = requests.Session()
-        session.auth = self.authenticator
+    def _get_available_properties(self) -> dict[str, dict[str, t.Any]]:
+        results = self._tap.property_cache.get(  # type: ignore[attr-defined]
+            self.name,
+            self._fetch_properties,
+        )
+        return self._select_properties({prop["name"]: prop for prop in results})
+
+    def _select_properties(
+        self,
+        properties: dict[str, dict[str, t.Any]],
+    ) -> dict[str, dict[str, t.Any]]:
+        """Apply the class and `stream_properties` include/exclude lists.
+
+        A property the config includes is requested even if the class
+        excludes it, and the replication key is always requested.
 
-        resp = session.get(
-            f"https://api.hubapi.com/crm/v3/properties/{self.name}",
+        Args:
+            properties: Every property HubSpot defines, mapped to its definition.
+
+        Returns:
+            The properties to request, mapped to their definition.
+        """
+        selection = (self.config.get("stream_properties") or {}).get(self.name, {})
+        include = selection.get("include", self.included_properties)
+        exclude = set(self.excluded_properties).difference(include or ())
+        exclude.update(selection.get("exclude") or ())
+        return {
+            name: definition
+            for name, definition in properties.items()
+            if name == self.replication_key
+            or ((include is None or name in include) and name not in exclude)
+        }
+
+    def _fetch_properties(self, headers: dict[str, str]) -> requests.Response:
+        # Retried like record requests, since discovery hits the same limits.
+        return self.request_decorator(self._get_properties)(headers)
+
+    def _get_properties(self, headers: dict[str, str]) -> requests.Response:
+        url = f"https://api.hubapi.com/crm/v3/properties/{self.name}"
+        self.rate_limiter.acquire(url)
+        resp = self.requests_session.get(
+            url,
+            headers=headers,
+            auth=self.authenticator,
+            timeout=self.timeout,
         )
-        resp.raise_for_status()
-        results = resp.json().get("results", [])
-        return {prop["name"]: prop["type"] for prop in results}
+        self.validate_response(resp)
+        return resp
+
+    def post_process(
+        self,
+        row: dict,
+        context: Context | None = None,  # noqa: ARG002
+    ) -> dict | None:
+        """Coerce the string values HubSpot returns to the property types.
+
+        Args:
+            row: Individual record in the stream.
+            context: Stream partition or context dictionary.
+
+        Returns:
+            The resulting record dict.
+        """
+        if self._coercers is None:
+            # Compiled once, so records only visit their typed properties.
+            self._coercers = (
+                compile_coercers(self.hs_properties) if self.typed_properties else {}
+            )
+        if self._coercers and (props := row.get("properties")):
+            for name, coerce in self._coercers.items():
+                value = props.get(name)
+                if isinstance(value, str):
+                    props[name] = coerce(value)
+        return row
 
     def get_url_params(
         self,
@@ -184,33 +791,221 @@ class DynamicHubspotStream(HubspotStream):
             A dictionary of URL query parameters.
         """
         params = super().get_url_params(context, next_page_token)
-        if self.hs_properties:
-            params["properties"] = ",".join(self.hs_properties)
+        if groups := self._property_groups():
+            params["properties"] = ",".join(groups[0])
         return params
 
+    @property
+    def object_path(self) -> str:
+        """Path of the object endpoints, which searching swaps `path` away from."""
+        return type(self).path  # type: ignore[misc]
+
+    @property
+    def hydrate_with_batch_read(self) -> bool:
+        """Whether pages only carry ids that are then fetched via batch/read."""
+        return bool(self.config.get("batch_read_hydration"))
+
+    def _page_properties(self) -> list[str]:
+        """Return the properties requested on list and search pages."""
+        if self.hydrate_with_batch_read:
+            return [self.replication_key] if self.replication_key else []
+        return list(self.hs_properties)
+
+    def _property_groups(self) -> list[list[str]]:
+        """Split the page properties into groups that each fit in a GET URL.
+
+        The replication key always leads the first group, which is the one
+        requested on list pages.
+        """
+        properties = self._page_properties()
+        if self.replication_key in properties:
+            properties.remove(self.replication_key)
+            properties.insert(0, self.replication_key)
+
+        groups: list[list[str]] = []
+        length = MAX_PROPERTIES_PARAM_LENGTH
+        for name in properties:
+            # Separating commas are sent percent-encoded.
+            size = len(quote(name)) + 3
+            if length + size > MAX_PROPERTIES_PARAM_LENGTH:
+                groups.append([])
+                length = 0
+            groups[-1].append(name)
+            length += size
+        return groups
+
+    def _is_incremental_search(self, context: Context | None) -> bool:  # noqa: ARG002
+        """Whether `context` is synced with POST requests to the search endpoint."""
+        return False
+
+    # Child streams read associations in batches, so the ids of the records
+    # synced are collected and handed over a batch at a time.
+
+    def get_child_context(
+        self,
+        record: dict,
+        context: Context | None,  # noqa: ARG002
+    ) -> dict | None:
+        """Return the id of `record`, to be batched for the child streams."""
+        if record.get("archived"):
+            # Archived records have no associations left to read.
+            return None
+        return {"id": record["id"]}
+
+    def _sync_children(self, child_context: Context | None) -> None:
+        if child_context is None or not any(
+            child.selected or child.has_selected_descendents
+            for child in self.child_streams
+        ):
+            return
+        self._child_ids.append(child_context["id"])
+        if len(self._child_ids) >= self._child_batch_size:
+            self._flush_children()
+
+    @property
+    def _child_batch_size(self) -> int:
+        # Enough ids for every worker of the child streams to read a batch.
+        workers = self.config.get("association_read_workers") or 1
+        return ASSOCIATIONS_BATCH_SIZE * workers
+
+    def _flush_children(self) -> None:
+        if not self._child_ids:
+            return
+        self._child_batches += 1
+        batch = AssociationBatch(self._child_batches, self._child_ids)
+        self._child_ids = []
+        super()._sync_children(batch)
+
+    def _sync_records(
+        self,
+        context: Context | None = None,
+        *,
+        write_messages: bool = True,
+    ) -> t.Generator[dict, t.Any, t.Any]:
+        yield from super()._sync_records(context, write_messages=write_messages)
+        self._flush_children()
+
+    def _batch_read(
+        self,
+        records: list[dict],
+        properties: list[str] | None = None,
+    ) -> list[dict]:
+        """Fetch the property payload of `records` in one batch/read call.
+
+        Args:
+            records: Records carrying at least their `id`.
+            properties: Properties to fetch, all of them by default.
+
+        Returns:
+            The hydrated records, in the order of `records`.
+        """
+        prepared_request = self.build_prepared_request(
+            method="POST",
+            url=f"{self.url_base}{self.object_path}/batch/read",
+            json={
+                "properties": (
+                    list(self.hs_properties) if properties is None else properties
+                ),
+                "inputs": [{"id": record["id"]} for record in records],
+            },
+            headers=self.http_headers,
+        )
+        response = self.request_decorator(self._request)(prepared_request, None)
+        by_id = {result["id"]: result for result in response_json(response)["results"]}
+        # Records deleted since their id was listed are skipped, but most of a
+        # batch going missing means the ids were not read as expected.
+        if len(by_id) * 2 < len(records):
+            self.logger.warning(
+                "batch/read of stream '%s' returned only %d of %d records.",
+                self.name,
+                len(by_id),
+                len(records),
+            )
+        return [by_id[record["id"]] for record in records if record["id"] in by_id]
+
+    def _read_property_groups(
+        self,
+        records: list[dict],
+        groups: list[list[str]],
+    ) -> list[dict]:
+        """Fill in the property groups a list page did not request.
+
+        Returns:
+            `records`, with the properties of every group merged in.
+        """
+        by_id = {record["id"]: record for record in records}
+        for group in groups:
+            for result in self._batch_read(records, group):
+                by_id[result["id"]].setdefault("properties", {}).update(
+                    result.get("properties") or {},
+                )
+        return records
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
+        """Return records, completing pages of ids via batch/read when needed.
+
+        Pages are hydrated via batch/read when enabled. Otherwise, when the
+        properties do not fit in a single GET URL, list pages request only the
+        first group and the others are merged in via batch/read.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            One item per (possibly processed) record in the API.
+        """
+        fetch: t.Callable[[list[dict]], list[dict]]
+        groups = self._property_groups()
+        if self.hydrate_with_batch_read:
+            fetch = self._batch_read
+        elif len(groups) > 1 and not self._is_incremental_search(context):
+            fetch = functools.partial(self._read_property_groups, groups=groups[1:])
+        else:
+            yield from super().get_records(context)
+            return
+
+        records = iter(self.request_records(context))
+        batches = iter(lambda: list(itertools.islice(records, BATCH_READ_SIZE)), [])
+        for hydrated in map_in_order(
+            fetch,
+            batches,
+            max_workers=self.config.get("batch_read_workers") or 1,
+        ):
+            for record in hydrated:
+                transformed_record = self._timed_post_process(record, context)
+                if transformed_record is not None:
+                    yield transformed_record
+
 
 class DynamicIncrementalHubspotStream(DynamicHubspotStream):
     """DynamicIncrementalHubspotStream."""
 
+    # Whether archived records are synced too when `archived_records` is set.
+    has_archived_records: t.ClassVar[bool] = False
+
     def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:  # noqa: D107
         super().__init__(*args, **kwargs)
 
+    @property  # type: ignore[misc]
+    def state_partitioning_keys(self) -> list[str]:
+        """Search windows are passed as contexts but share the stream bookmark."""
+        return []
+
     def _is_incremental_search(self, context: Context | None) -> bool:
         return (
-            self.replication_method == REPLICATION_INCREMENTAL  # type: ignore[return-value]
+            not _is_archived(context)
+            and self.replication_method == REPLICATION_INCREMENTAL  # type: ignore[return-value]
             and self.get_starting_replication_key_value(context)
             and hasattr(self, "incremental_path")
             and self.incremental_path
         )
 
-    @cached_property
-    def schema(self) -> dict:
-        """Return a draft JSON schema for this stream."""
+    def _get_schema(self) -> dict:
         hs_props = []
         self.hs_properties = self._get_available_properties()
-        for name, prop_type in self.hs_properties.items():
+        for name, definition in self.hs_properties.items():
             hs_props.append(
-                th.Property(name, self._get_datatype(prop_type)),
+                th.Property(name, self._get_datatype(definition)),
             )
         schema = th.PropertiesList(
             th.Property("id", th.StringType),
@@ -221,6 +1016,7 @@ class DynamicIncrementalHubspotStream(DynamicHubspotStream):
             th.Property("createdAt", th.DateTimeType),
             th.Property("updatedAt", th.DateTimeType),
             th.Property("archived", th.BooleanType),
+            th.Property("archivedAt", th.DateTimeType),
         )
         if self.replication_key:
             schema.append(
@@ -247,12 +1043,19 @@ class DynamicIncrementalHubspotStream(DynamicHubspotStream):
         """
         if self._is_incremental_search(context):
             return {}
+        if _is_archived(context):
+            # Archived records are only listed to record their deletion.
+            params = HubspotStream.get_url_params(self, context, next_page_token)
+            params["archived"] = "true"
+            if self.replication_key:
+                params["properties"] = self.replication_key
+            return params
         return super().get_url_params(context, next_page_token)
 
     def post_process(
         self,
         row: dict,
-        context: Context | None = None,  # noqa: ARG002
+        context: Context | None = None,
     ) -> dict | None:
         """As needed, append or transform raw data to match expected structure.
 
@@ -270,6 +1073,7 @@ class DynamicIncrementalHubspotStream(DynamicHubspotStream):
         Returns:
             The resulting record dict, or `None` if the record should be excluded.
         """
+        row = super().post_process(row, context)  # type: ignore[assignment]
         if self.replication_key:
             val = None
             if props := row.get("properties"):
@@ -286,6 +1090,10 @@ class DynamicIncrementalHubspotStream(DynamicHubspotStream):
             # Search endpoints use POST request
             self.path = self.incremental_path  # type: ignore[attr-defined]
             self.http_method = "POST"
+        elif _is_archived(context):
+            # Archived records are listed once searching is over.
+            self.path = self.object_path
+            self.http_method = "GET"
         return super().prepare_request(context, next_page_token)
 
     def prepare_request_payload(
@@ -310,49 +1118,446 @@ class DynamicIncrementalHubspotStream(DynamicHubspotStream):
         if self._is_incremental_search(context):
             # Only filter in case we have a value to filter on
             # https://developers.hubspot.com/docs/api/crm/search
-            ts = datetime.datetime.fromisoformat(
-                self.get_starting_replication_key_value(context),  # type: ignore[arg-type]
-            )
+            window = context or {}
             if next_page_token:
                 # Hubspot wont return more than 10k records so when we hit 10k we
-                # need to reset our epoch to most recent and not send the
-                # next_page_token
-                if int(next_page_token) + 100 >= 10000:  # noqa: PLR2004
-                    ts = strptime_to_utc(
-                        self.get_context_state(context)  # type: ignore[union-attr]
-                        .get("progress_markers")
-                        .get("replication_key_value"),
-                    )
+                # need to restart the window from the most recent record and not
+                # send the next_page_token
+                if int(next_page_token) + SEARCH_PAGE_SIZE > SEARCH_RESULT_LIMIT:
+                    self._restart_window(window)  # type: ignore[arg-type]
                 else:
                     body["after"] = next_page_token
-            epoch_ts = str(int(ts.timestamp() * 1000))
 
             body.update(
+                self._search_body(
+                    window.get("window_start") or self._starting_epoch_ms(context),
+                    window.get("window_end") or self._ending_epoch_ms(),
+                    after_id=window.get("after_id"),
+                ),
+            )
+            body["properties"] = self._page_properties()
+
+        return body
+
+    def _restart_window(self, window: SearchWindow) -> None:
+        """Move `window` past the records received, to page on past 10k results."""
+        self.stream_metrics.increment("search_window_restarts")
+        if "after_id" in window:
+            window["after_id"] = window["last_id"]
+            return
+
+        cursor_ms = _epoch_ms(strptime_to_utc(window["cursor"]))
+        if cursor_ms > window["window_start"]:
+            window["window_start"] = cursor_ms
+            return
+
+        # Every result so far shares one millisecond, so restarting there would
+        # loop. Page through that millisecond by record id, then carry on with
+        # the rest of the window.
+        rest = SearchWindow(cursor_ms + 1, window["window_end"])
+        rest.next = window.next
+        window.next = rest
+        window["window_end"] = cursor_ms + 1
+        window["after_id"] = "0"
+        self.logger.info(
+            "More than %d '%s' records share %s, paging through them by id.",
+            SEARCH_RESULT_LIMIT,
+            self.name,
+            window["cursor"],
+        )
+
+    def _search_body(
+        self,
+        start_ms: int,
+        end_ms: int | None,
+        limit: int = SEARCH_PAGE_SIZE,
+        after_id: str | None = None,
+    ) -> dict[str, t.Any]:
+        filters = [
+            {
+                "propertyName": self.replication_key,
+                "operator": "GTE",
+                # Timestamps need to be in milliseconds
+                # https://legacydocs.hubspot.com/docs/faq/how-should-timestamps-be-formatted-for-hubspots-apis
+                "value": str(start_ms),
+            },
+        ]
+        if end_ms is not None:
+            filters.append(
                 {
-                    "filterGroups": [
-                        {
-                            "filters": [
-                                {
-                                    "propertyName": self.replication_key,
-                                    "operator": "GTE",
-                                    # Timestamps need to be in milliseconds
-                                    # https://legacydocs.hubspot.com/docs/faq/how-should-timestamps-be-formatted-for-hubspots-apis
-                                    "value": epoch_ts,
-                                },
-                            ],
-                        },
-                    ],
-                    "sorts": [
-                        {
-                            # This is inside the properties object
-                            "propertyName": self.replication_key,
-                            "direction": "ASCENDING",
-                        },
-                    ],
-                    # Hubspot sets a limit of most 100 per request. Default is 10
-                    "limit": 100,
-                    "properties": list(self.hs_properties),
+                    "propertyName": self.replication_key,
+                    "operator": "LT",
+                    "value": str(end_ms),
                 },
             )
+        sort_by = self.replication_key
+        if after_id is not None:
+            filters.append(
+                {"propertyName": "hs_object_id", "operator": "GT", "value": after_id},
+            )
+            sort_by = "hs_object_id"
+        return {
+            "filterGroups": [{"filters": filters}],
+            "sorts": [
+                {
+                    # This is inside the properties object
+                    "propertyName": sort_by,
+                    "direction": "ASCENDING",
+                },
+            ],
+            # Hubspot sets a limit of most 100 per request. Default is 10
+            "limit": limit,
+        }
 
-        return body
+    def _starting_epoch_ms(self, context: Context | None) -> int:
+        return _epoch_ms(
+            datetime.datetime.fromisoformat(
+                self.get_starting_replication_key_value(context),  # type: ignore[arg-type]
+            ),
+        )
+
+    def _ending_epoch_ms(self) -> int | None:
+        return None if self._end_date is None else _epoch_ms(self._end_date)
+
+    def _count_search_results(self, start_ms: int, end_ms: int) -> int:
+        """Return how many records the search endpoint holds in a time window."""
+        body = self._search_body(start_ms, end_ms, limit=1)
+        body["properties"] = [self.replication_key]
+        prepared_request = self.build_prepared_request(
+            method="POST",
+            url=f"{self.url_base}{self.incremental_path}",  # type: ignore[attr-defined]
+            json=body,
+            headers=self.http_headers,
+        )
+        response = self.request_decorator(self._request)(prepared_request, None)
+        return int(response_json(response).get("total", 0))
+
+    def _plan_search_windows(self) -> list[SearchWindow]:
+        """Split the sync range into windows the search endpoint can fully page.
+
+        Any window holding more than `SEARCH_RESULT_LIMIT` records is divided
+        into equal slices until each fits, and empty windows are dropped. A
+        single millisecond holding more is paged through by record id.
+
+        Returns:
+            Window contexts in ascending time order.
+        """
+        start_ms = self._starting_epoch_ms(None)
+        end_ms = self._ending_epoch_ms() or _epoch_ms(
+            datetime.datetime.now(datetime.timezone.utc),
+        )
+
+        windows: list[SearchWindow] = []
+        pending = [(start_ms, end_ms)]
+        while pending:
+            lo, hi = pending.pop()
+            if lo >= hi:
+                continue
+            total = self._count_search_results(lo, hi)
+            if total > SEARCH_RESULT_LIMIT and hi - lo > 1:
+                parts = min(hi - lo, math.ceil(total / SEARCH_RESULT_LIMIT) + 1)
+                bounds = [lo + (hi - lo) * i // parts for i in range(parts + 1)]
+                # Push in reverse so windows come off the stack in time order.
+                pending.extend(reversed(list(zip(bounds, bounds[1:]))))
+            elif total:
+                window = SearchWindow(lo, hi)
+                if total > SEARCH_RESULT_LIMIT:
+                    window["after_id"] = "0"
+                windows.append(window)
+
+        self.logger.info(
+            "Planned %d search windows for stream '%s'.",
+            len(windows),
+            self.name,
+        )
+        return windows
+
+    def _page_received(self, page: list[dict], context: Context | None) -> list[dict]:
+        if not isinstance(context, SearchWindow):
+            return super()._page_received(page, context)
+        # Tracked as pages arrive, since they may run ahead of the records
+        # being processed.
+        context["last_id"] = page[-1]["id"]
+        if "after_id" in context:
+            # Id-sorted paging never returns a record twice, but may return the
+            # ones received before the window switched to it.
+            context["cursor"] = page[-1]["properties"][self.replication_key]
+            return [record for record in page if record["id"] not in context.cursor_ids]
+
+        # A restarted window returns the records received at its cursor again.
+        fresh = []
+        for record in page:
+            value = record["properties"][self.replication_key]
+            if value != context.get("cursor"):
+                context["cursor"] = value
+                context.cursor_ids = set()
+            elif record["id"] in context.cursor_ids:
+                continue
+            context.cursor_ids.add(record["id"])
+            fresh.append(record)
+        return fresh
+
+    def _get_window_records(self, window: SearchWindow) -> t.Iterable[dict[str, t.Any]]:
+        current: SearchWindow | None = window
+        while current is not None:
+            yield from super().get_records(current)
+            current = current.next
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
+        """Return records, fetching search windows concurrently when searching.
+
+        While searching, a resumable checkpoint of the stream state is written
+        every `checkpoint_interval_records` records or
+        `checkpoint_interval_seconds` seconds. Records archived since the
+        previous sync follow the live ones, when enabled.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Yields:
+            One item per (possibly processed) record in the API.
+        """
+        if context is not None or not self._is_incremental_search(context):
+            yield from super().get_records(context)
+        else:
+            yield from self._get_search_records()
+        if context is None and self.syncs_archived_records:
+            yield from self._get_archived_records()
+
+    def _get_search_records(self) -> t.Iterable[dict[str, t.Any]]:
+        producers = [
+            functools.partial(self._get_window_records, window)
+            for window in self._plan_search_windows()
+        ]
+        every_records = self.config.get(
+            "checkpoint_interval_records",
+            DEFAULT_CHECKPOINT_INTERVAL_RECORDS,
+        )
+        every_seconds = self.config.get(
+            "checkpoint_interval_seconds",
+            DEFAULT_CHECKPOINT_INTERVAL_SECONDS,
+        )
+        last_checkpoint = time.monotonic()
+        since_checkpoint = 0
+        last_value = None
+
+        for record in iter_in_order(
+            producers,
+            max_workers=self.config.get("max_parallel_search_windows") or 1,
+        ):
+            # Windows are consumed in time order and sorted within, so once the
+            # previous record has been written every older one has been too.
+            elapsed = time.monotonic() - last_checkpoint
+            if since_checkpoint and (
+                (every_records and since_checkpoint >= every_records)
+                or (every_seconds and elapsed >= every_seconds)
+            ):
+                self._write_checkpoint(last_value)
+                last_checkpoint = time.monotonic()
+                since_checkpoint = 0
+
+            last_value = record.get(self.replication_key)  # type: ignore[arg-type]
+            since_checkpoint += 1
+            yield record
+
+    @property
+    def syncs_archived_records(self) -> bool:
+        """Whether records archived since the previous sync are emitted."""
+        return self.has_archived_records and bool(self.config.get("archived_records"))
+
+    def _get_archived_records(self) -> t.Iterable[dict[str, t.Any]]:
+        """Return the records archived since the `archivedAt` bookmark.
+
+        HubSpot lists archived records by id, so every page is read and only
+        records archived after the bookmark (or `start_date`) are emitted.
+
+        Yields:
+            One soft-deleted record per record archived since the bookmark.
+        """
+        with self._tap.message_lock:  # type: ignore[attr-defined]
+            bookmark = self.stream_state.get(ARCHIVED_BOOKMARK_KEY)
+        bookmark = bookmark or self.config.get("start_date")
+        since = strptime_to_utc(bookmark) if bookmark else None
+        latest = since
+        for record in self.request_records(ARCHIVED_CONTEXT):
+            archived_at = strptime_to_utc(record["archivedAt"])
+            if since is not None and archived_at <= since:
+                continue
+            if latest is None or archived_at > latest:
+                latest = archived_at
+            transformed_record = self._timed_post_process(record, ARCHIVED_CONTEXT)
+            if transformed_record is not None:
+                yield transformed_record
+
+        if latest is not None and latest != since:
+            with self._tap.message_lock:  # type: ignore[attr-defined]
+                self.stream_state[ARCHIVED_BOOKMARK_KEY] = latest.isoformat()
+
+    def _increment_stream_state(
+        self,
+        latest_record: dict[str, t.Any],
+        *,
+        context: Context | None = None,
+    ) -> None:
+        # Archived records are bookmarked separately, on `archivedAt`.
+        if not latest_record.get("archived"):
+            super()._increment_stream_state(latest_record, context=context)
+
+    def _write_checkpoint(self, value: t.Any) -> None:  # noqa: ANN401
+        """Write a STATE message the sync can resume from after a failure.
+
+        The bookmark is all a resumed sync needs: it plans its search windows
+        from there, and only re-reads the records sharing that value.
+
+        Args:
+            value: The replication key value of the last written record.
+        """
+        if value is None:
+            return
+        with self._tap.message_lock:  # type: ignore[attr-defined]
+            state = self.stream_state
+            state["replication_key"] = self.replication_key
+            state["replication_key_value"] = value
+            self._is_state_flushed = False
+            self._write_state_message()
+
+
+class HubspotAssociationStream(HubspotStream):
+    """Associations of the records synced by a parent object stream.
+
+    The parent stream hands the ids of its records over in batches, and the
+    associations of every batch are read with one v4 batch/read call per
+    associated object type, split in `ASSOCIATIONS_BATCH_SIZE` ids.
+    """
+
+    # Object types whose associations with the parent records are read.
+    to_object_types: t.ClassVar[tuple[str, ...]] = ()
+
+    primary_keys = ("from_id", "to_object_type", "to_id")
+    replication_method = "FULL_TABLE"
+    path = "/associations"
+
+    schema = th.PropertiesList(
+        th.Property("from_object_type", th.StringType),
+        th.Property("from_id", th.StringType),
+        th.Property("to_object_type", th.StringType),
+        th.Property("to_id", th.StringType),
+        th.Property(
+            "association_types",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property("category", th.StringType),
+                    th.Property("typeId", th.IntegerType),
+                    th.Property("label", th.StringType),
+                ),
+            ),
+        ),
+    ).to_dict()
+
+    @property
+    def url_base(self) -> str:
+        """Returns an updated path which includes the api version."""
+        return "https://api.hubapi.com/crm/v4"
+
+    @property  # type: ignore[misc]
+    def state_partitioning_keys(self) -> list[str]:
+        """Batches are passed as contexts but share the stream state."""
+        return []
+
+    @property
+    def from_object_type(self) -> str:
+        """Object type of the parent stream."""
+        return self.parent_stream_type.name  # type: ignore[union-attr,misc]
+
+    def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
+        """Return the associations of a batch of parent records.
+
+        Args:
+            context: The `AssociationBatch` of the parent records.
+
+        Yields:
+            One record per associated pair of objects.
+        """
+        object_ids: list[str] = getattr(context, "object_ids", [])
+        reads = [
+            (to_object_type, object_ids[i : i + ASSOCIATIONS_BATCH_SIZE])
+            for to_object_type in self.to_object_types
+            for i in range(0, len(object_ids), ASSOCIATIONS_BATCH_SIZE)
+        ]
+        for records in map_in_order(
+            lambda read: list(self._read_associations(*read)),
+            reads,
+            max_workers=self.config.get("association_read_workers") or 1,
+        ):
+            yield from records
+
+    def _read_associations(
+        self,
+        to_object_type: str,
+        object_ids: list[str],
+    ) -> t.Iterator[dict[str, t.Any]]:
+        """Read the associations of `object_ids` with one batch/read call."""
+        prepared_request = self.build_prepared_request(
+            method="POST",
+            url=(
+                f"{self.url_base}/associations/{self.from_object_type}"
+                f"/{to_object_type}/batch/read"
+            ),
+            json={"inputs": [{"id": object_id} for object_id in object_ids]},
+            headers=self.http_headers,
+        )
+        response = self.request_decorator(self._request)(prepared_request, None)
+        # Records without associations are reported as errors, and skipped.
+        for result in response_json(response).get("results", []):
+            from_id = str(result["from"]["id"])
+            associations = result.get("to", [])
+            after = (result.get("paging") or {}).get("next", {}).get("after")
+            while True:
+                for association in associations:
+                    yield self._association_record(from_id, to_object_type, association)
+                if not after:
+                    break
+                associations, after = self._read_more_associations(
+                    from_id,
+                    to_object_type,
+                    after,
+                )
+
+    def _read_more_associations(
+        self,
+        from_id: str,
+        to_object_type: str,
+        after: str,
+    ) -> tuple[list[dict], str | None]:
+        """Read the associations a batch/read result was truncated at.
+
+        Returns:
+            The next page of associations and the cursor of the following one.
+        """
+        prepared_request = self.build_prepared_request(
+            method="GET",
+            url=(
+                f"{self.url_base}/objects/{self.from_object_type}/{from_id}"
+                f"/associations/{to_object_type}"
+            ),
+            params={"limit": ASSOCIATIONS_PAGE_SIZE, "after": after},
+            headers=self.http_headers,
+        )
+        response = self.request_decorator(self._request)(prepared_request, None)
+        data = response_json(response)
+        next_page = (data.get("paging") or {}).get("next") or {}
+        return data.get("results", []), next_page.get("after")
+
+    def _association_record(
+        self,
+        from_id: str,
+        to_object_type: str,
+        association: dict[str, t.Any],
+    ) -> dict[str, t.Any]:
+        return {
+            "from_object_type": self.from_object_type,
+            "from_id": from_id,
+            "to_object_type": to_object_type,
+            "to_id": str(association["toObjectId"]),
+            "association_types": association.get("associationTypes", []),
+        }
@@ -0,0 +1,166 @@
+"""Helpers for fetching HubSpot data on worker threads."""
+
+from __future__ import annotations
+
+import collections
+import queue
+import threading
+import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
+
+T = t.TypeVar("T")
+R = t.TypeVar("R")
+
+_DONE = object()
+_PUT_TIMEOUT = 0.1
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def _put(q: queue.Queue, item: t.Any, stop: threading.Event) -> bool:  # noqa: ANN401
+    """Put `item` on a bounded queue, giving up once `stop` is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_PUT_TIMEOUT)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _produce(
+    producer: t.Callable[[], t.Iterable[t.Any]],
+    q: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    try:
+        for item in producer():
+            if not _put(q, item, stop):
+                return
+    except BaseException as exc:  # noqa: BLE001
+        _put(q, _Failure(exc), stop)
+    else:
+        _put(q, _DONE, stop)
+
+
+def _drain(q: queue.Queue) -> t.Iterator[t.Any]:
+    """Yield the items a producer puts on `q`, re-raising its exception."""
+    while (item := q.get()) is not _DONE:
+        if isinstance(item, _Failure):
+            raise item.exc
+        yield item
+
+
+def iter_in_order(
+    producers: t.Sequence[t.Callable[[], t.Iterable[T]]],
+    max_workers: int,
+    buffer_size: int = 1000,
+) -> t.Iterator[T]:
+    """Run producers on worker threads and yield their items in producer order.
+
+    Up to `max_workers` producers run ahead of the consumer, each buffering at
+    most `buffer_size` items, so memory stays bounded however large the inputs
+    are. An exception raised by a producer is re-raised in the consumer when
+    its turn comes. Closing the returned generator stops every worker.
+
+    Args:
+        producers: Callables returning the iterables to consume, in order.
+        max_workers: Maximum number of producers running at once.
+        buffer_size: Maximum number of items buffered per producer.
+
+    Yields:
+        Every item of every producer, in order.
+    """
+    if max_workers <= 1 or len(producers) <= 1:
+        for producer in producers:
+            yield from producer()
+        return
+
+    stop = threading.Event()
+    queues: list[queue.Queue] = [queue.Queue(maxsize=buffer_size) for _ in producers]
+
+    # Producers start in submission order, so the one being consumed is always
+    # running or finished and blocked producers further ahead cannot starve it.
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = [
+        executor.submit(_produce, producer, q, stop)
+        for producer, q in zip(producers, queues)
+    ]
+    try:
+        for q in queues:
+            yield from _drain(q)
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def iter_ahead(
+    producer: t.Callable[[], t.Iterable[T]],
+    buffer_size: int,
+) -> t.Iterator[T]:
+    """Run a producer on a worker thread, ahead of the consumer.
+
+    At most `buffer_size` items are buffered, so the producer overlaps with
+    the work done on each item without running arbitrarily far ahead. An
+    exception raised by the producer is re-raised in the consumer, and
+    closing the returned generator stops the worker.
+
+    Args:
+        producer: Callable returning the iterable to consume.
+        buffer_size: Maximum number of items buffered ahead of the consumer.
+
+    Yields:
+        Every item of the producer, in order.
+    """
+    stop = threading.Event()
+    q: queue.Queue = queue.Queue(maxsize=buffer_size)
+    worker = threading.Thread(target=_produce, args=(producer, q, stop), daemon=True)
+    worker.start()
+    try:
+        yield from _drain(q)
+    finally:
+        stop.set()
+        worker.join()
+
+
+def map_in_order(
+    func: t.Callable[[T], R],
+    items: t.Iterable[T],
+    max_workers: int,
+) -> t.Iterator[R]:
+    """Apply `func` to each item on worker threads, yielding results in order.
+
+    Items are pulled lazily, keeping at most `max_workers` calls in flight, so
+    producing the next item overlaps with the work on earlier ones.
+
+    Args:
+        func: The function to apply.
+        items: The inputs, consumed on the calling thread.
+        max_workers: Maximum number of concurrent calls.
+
+    Yields:
+        `func(item)` for every item, in input order.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending: collections.deque[Future[R]] = collections.deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,120 @@
+"""Record conformance compiled once per stream schema."""
+
+from __future__ import annotations
+
+import typing as t
+
+from singer_sdk.helpers._typing import (
+    TypeConformanceLevel,
+    _conform_primitive_property,
+    _conform_uniform_list,
+    _is_exclusive_boolean_type,
+    is_object_type,
+    is_uniform_list,
+)
+
+if t.TYPE_CHECKING:
+    from singer_sdk._singerlib import SelectionMask
+
+_Handler = t.Callable[[t.Any, str], tuple[t.Any, list[str]]]
+
+
+def _primitive_handler(schema: dict) -> _Handler:
+    def handle(value: t.Any, path: str) -> tuple[t.Any, list[str]]:  # noqa: ANN401, ARG001
+        return _conform_primitive_property(value, schema), []
+
+    return handle
+
+
+def _list_handler(schema: dict) -> _Handler:
+    def handle(value: t.Any, path: str) -> tuple[t.Any, list[str]]:  # noqa: ANN401
+        if isinstance(value, list):
+            return _conform_uniform_list(
+                value,
+                path=path,
+                schema=schema,
+                level=TypeConformanceLevel.RECURSIVE,
+            )
+        return _conform_primitive_property(value, schema), []
+
+    return handle
+
+
+class RecordConformer:
+    """Drop deselected and unmapped properties and conform values to a schema.
+
+    This matches the SDK's `pop_deselected_record_properties` followed by a
+    recursive `conform_record_data_types`, for records decoded from JSON. The
+    schema and selection mask are walked once, up front: per record, only
+    properties that are unknown, deselected, nested or need converting are
+    visited, so the cost no longer grows with the width of the schema. In
+    particular, the many string properties of a dynamic stream are left alone.
+    """
+
+    def __init__(
+        self,
+        schema: dict,
+        mask: SelectionMask,
+        breadcrumb: tuple[str, ...] = (),
+    ) -> None:
+        """Compile the conformance of `schema`.
+
+        Args:
+            schema: JSON schema of the records, or of a nested object.
+            mask: Selection mask of the stream.
+            breadcrumb: Breadcrumb of `schema` within the stream schema.
+        """
+        properties: dict[str, dict] = schema.get("properties") or {}
+        self.names = frozenset(properties)
+        self.keep_unmapped = bool(schema.get("additionalProperties"))
+        deselected = set()
+        self.handlers: dict[str, _Handler] = {}
+        for name, prop in properties.items():
+            property_breadcrumb = (*breadcrumb, "properties", name)
+            if not mask[property_breadcrumb]:
+                deselected.add(name)
+            if is_object_type(prop) and "properties" in prop:
+                nested = RecordConformer(prop, mask, property_breadcrumb)
+                self.handlers[name] = nested.conform_value
+            elif is_uniform_list(prop):
+                self.handlers[name] = _list_handler(prop)
+            elif _is_exclusive_boolean_type(prop):
+                self.handlers[name] = _primitive_handler(prop)
+        self.deselected = frozenset(deselected)
+
+    def conform_value(self, value: t.Any, path: str) -> tuple[t.Any, list[str]]:  # noqa: ANN401
+        """Conform a nested object, or any other value found in its place."""
+        if isinstance(value, dict):
+            return self(value, path)
+        return value, []
+
+    def __call__(
+        self,
+        record: dict[str, t.Any],
+        parent: str | None = None,
+    ) -> tuple[dict[str, t.Any], list[str]]:
+        """Conform `record` in place.
+
+        Args:
+            record: The record, or a nested object of it.
+            parent: Dotted path of `record` within the stream record.
+
+        Returns:
+            The conformed record and the paths of its unmapped properties.
+        """
+        prefix = "" if parent is None else f"{parent}."
+        unmapped: list[str] = []
+
+        for name in self.deselected.intersection(record):
+            del record[name]
+        for name in record.keys() - self.names:
+            unmapped.append(f"{prefix}{name}")
+            if not self.keep_unmapped:
+                del record[name]
+        for name in self.handlers.keys() & record.keys():
+            record[name], nested_unmapped = self.handlers[name](
+                record[name],
+                f"{prefix}{name}",
+            )
+            unmapped.extend(nested_unmapped)
+        return record, unmapped
@@ -0,0 +1,292 @@
+"""Per-stream instrumentation of the sync pipeline."""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import typing as t
+from http import HTTPStatus
+from pathlib import Path
+
+from singer_sdk.metrics import METRICS_LOGGER_NAME
+
+from tap_hubspot.ratelimit import HEADER_REMAINING, _int_header
+
+if t.TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_INTERVAL = 60.0
+METRIC_PREFIX = "hubspot"
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNTERS = (
+    "requests",
+    "response_bytes",
+    "pages",
+    "records",
+    "throttled_responses",
+    "search_window_restarts",
+)
+# Where a stream spends its time: waiting for the rate limiter, sending
+# requests and reading responses, decoding them, `post_process`, conforming
+# records to the schema and writing messages to stdout. Stages running in
+# worker threads overlap, so their sum can exceed the wall-clock time.
+STAGES = ("rate_limit_wait", "network", "parse", "post_process", "conform", "write")
+
+
+class StreamMetrics:
+    """Thread-safe measurements of one stream's sync."""
+
+    def __init__(self, stream: str) -> None:
+        """Create empty measurements.
+
+        Args:
+            stream: Name of the stream measured.
+        """
+        self.stream = stream
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._stage_seconds: dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        # One count per bucket of LATENCY_BUCKETS, then the overflow bucket.
+        self._latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._latency_sum = 0.0
+        self._rate_limit_remaining: int | None = None
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        """Add `value` to `counter`."""
+        with self._lock:
+            self._counters[counter] += value
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add `seconds` to the time spent in `stage`."""
+        with self._lock:
+            self._stage_seconds[stage] += seconds
+
+    @contextlib.contextmanager
+    def time(self, stage: str) -> t.Iterator[None]:
+        """Measure the time spent in the `with` block as time spent in `stage`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - started)
+
+    def observe_response(self, response: requests.Response) -> None:
+        """Count a response, its size and its latency."""
+        latency = response.elapsed.total_seconds()
+        remaining = _int_header(response, HEADER_REMAINING)
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["response_bytes"] += len(response.content or b"")
+            if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                self._counters["throttled_responses"] += 1
+            self._latency_counts[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            self._latency_sum += latency
+            if remaining is not None:
+                self._rate_limit_remaining = remaining
+
+    def snapshot(self) -> dict[str, t.Any]:
+        """Return a consistent copy of the measurements."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "stage_seconds": dict(self._stage_seconds),
+                "latency_counts": list(self._latency_counts),
+                "latency_sum": self._latency_sum,
+                "rate_limit_remaining": self._rate_limit_remaining,
+            }
+
+
+def _cumulative_buckets(counts: list[int]) -> dict[str, int]:
+    bounds = [*map(str, LATENCY_BUCKETS), "+Inf"]
+    total = 0
+    buckets = {}
+    for bound, count in zip(bounds, counts):
+        total += count
+        buckets[bound] = total
+    return buckets
+
+
+def metric_points(name: str, snapshot: dict[str, t.Any]) -> list[dict[str, t.Any]]:
+    """Return the metric points of a stream snapshot, as the SDK logs them.
+
+    Args:
+        name: Name of the stream measured.
+        snapshot: What :meth:`StreamMetrics.snapshot` returned.
+
+    Returns:
+        One `{"type", "metric", "value", "tags"}` dict per measurement.
+    """
+    tags = {"stream": name, "pid": os.getpid()}
+    points = [
+        {
+            "type": "counter",
+            "metric": f"{METRIC_PREFIX}.{counter}",
+            "value": value,
+            "tags": tags,
+        }
+        for counter, value in snapshot["counters"].items()
+    ]
+    points.extend(
+        {
+            "type": "timer",
+            "metric": f"{METRIC_PREFIX}.stage_duration",
+            "value": round(seconds, 6),
+            "tags": {**tags, "stage": stage},
+        }
+        for stage, seconds in snapshot["stage_seconds"].items()
+    )
+    points.append(
+        {
+            "type": "histogram",
+            "metric": f"{METRIC_PREFIX}.request_latency",
+            "value": {
+                "buckets": _cumulative_buckets(snapshot["latency_counts"]),
+                "sum": round(snapshot["latency_sum"], 6),
+                "count": sum(snapshot["latency_counts"]),
+            },
+            "tags": tags,
+        },
+    )
+    if snapshot["rate_limit_remaining"] is not None:
+        points.append(
+            {
+                "type": "gauge",
+                "metric": f"{METRIC_PREFIX}.rate_limit_remaining",
+                "value": snapshot["rate_limit_remaining"],
+                "tags": tags,
+            },
+        )
+    return points
+
+
+def prometheus_text(snapshots: t.Mapping[str, dict[str, t.Any]]) -> str:
+    """Return stream snapshots in the Prometheus text exposition format.
+
+    Args:
+        snapshots: What :meth:`StreamMetrics.snapshot` returned, by stream name.
+
+    Returns:
+        The metrics, ready for the node exporter's textfile collector.
+    """
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str) -> str:
+        metric = f"tap_{METRIC_PREFIX}_{name}"
+        lines.extend((f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"))
+        return metric
+
+    for counter in COUNTERS:
+        metric = family(f"{counter}_total", "counter", f"Stream {counter}.")
+        lines.extend(
+            f'{metric}{{stream="{name}"}} {snapshot["counters"][counter]}'
+            for name, snapshot in snapshots.items()
+        )
+
+    metric = family("stage_seconds_total", "counter", "Time spent per stage.")
+    lines.extend(
+        f'{metric}{{stream="{name}",stage="{stage}"}} {seconds:.6f}'
+        for name, snapshot in snapshots.items()
+        for stage, seconds in snapshot["stage_seconds"].items()
+    )
+
+    metric = family("request_latency_seconds", "histogram", "Request latency.")
+    for name, snapshot in snapshots.items():
+        buckets = _cumulative_buckets(snapshot["latency_counts"])
+        lines.extend(
+            f'{metric}_bucket{{stream="{name}",le="{bound}"}} {count}'
+            for bound, count in buckets.items()
+        )
+        lines.append(f'{metric}_sum{{stream="{name}"}} {snapshot["latency_sum"]:.6f}')
+        lines.append(f'{metric}_count{{stream="{name}"}} {buckets["+Inf"]}')
+
+    metric = family(
+        "rate_limit_remaining",
+        "gauge",
+        "Requests left in the rate limit interval, as last reported.",
+    )
+    lines.extend(
+        f'{metric}{{stream="{name}"}} {snapshot["rate_limit_remaining"]}'
+        for name, snapshot in snapshots.items()
+        if snapshot["rate_limit_remaining"] is not None
+    )
+    return "\n".join(lines) + "\n"
+
+
+class MetricsRegistry:
+    """Measurements of every stream of a tap run, and their reporting.
+
+    Measurements are logged as `METRIC: {...}` lines on the SDK's metrics
+    logger, at most every `interval` seconds per stream and once more at the
+    end of the run, and optionally written to a Prometheus textfile.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_METRICS_INTERVAL,
+        textfile: str | None = None,
+    ) -> None:
+        """Create the registry.
+
+        Args:
+            interval: Seconds between two reports of the same stream.
+            textfile: Path of the Prometheus textfile to keep up to date.
+        """
+        self.interval = interval
+        self.textfile = Path(textfile) if textfile else None
+        self._lock = threading.Lock()
+        self._streams: dict[str, StreamMetrics] = {}
+        self._next_report: dict[str, float] = {}
+        self._metrics_logger = logging.getLogger(METRICS_LOGGER_NAME)
+
+    def stream(self, name: str) -> StreamMetrics:
+        """Return the measurements of stream `name`."""
+        with self._lock:
+            if name not in self._streams:
+                self._streams[name] = StreamMetrics(name)
+                self._next_report[name] = time.monotonic() + self.interval
+            return self._streams[name]
+
+    def report_if_due(self, name: str) -> None:
+        """Report the measurements of stream `name` if `interval` has elapsed."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_report[name]:
+                return
+            self._next_report[name] = now + self.interval
+        self.report([name])
+
+    def report(self, names: t.Iterable[str] | None = None) -> None:
+        """Report the measurements of `names`, or of every stream measured."""
+        with self._lock:
+            streams = dict(self._streams)
+        snapshots = {name: metrics.snapshot() for name, metrics in streams.items()}
+        for name in snapshots if names is None else names:
+            for point in metric_points(name, snapshots[name]):
+                self._metrics_logger.info(
+                    "METRIC: %s",
+                    json.dumps(point, default=str),
+                )
+        if self.textfile:
+            self._write_textfile(self.textfile, prometheus_text(snapshots))
+
+    def _write_textfile(self, path: Path, text: str) -> None:
+        # Written aside and renamed, so the collector never reads a partial file.
+        with self._lock:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                with os.fdopen(fd, "w") as tmp:
+                    tmp.write(text)
+                Path(tmp_name).replace(path)
+            except OSError:
+                logger.warning("Could not write metrics textfile %s", path)
@@ -0,0 +1,149 @@
+"""Opt-in cProfile sessions per stream."""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import typing as t
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR_ENV = "TAP_HUBSPOT_PROFILE_DIR"
+# Functions listed in the text summary written next to each profile.
+SUMMARY_FUNCTIONS = 50
+
+# Only one profiler may be active in a thread, so each thread keeps the stack
+# of the profiles its sessions opened; only the innermost one is enabled.
+_sessions = threading.local()
+
+
+def _enable(profile: cProfile.Profile) -> bool:
+    try:
+        profile.enable()
+    except ValueError:
+        # From Python 3.12 on, one profiler may run per process at a time, so
+        # work done while another thread is profiled goes unprofiled.
+        return False
+    return True
+
+
+def profile_dir(config: t.Mapping[str, t.Any]) -> Path | None:
+    """Return where profiles are written, or None when profiling is off.
+
+    Args:
+        config: The tap config. `profile_dir` takes precedence over the
+            `TAP_HUBSPOT_PROFILE_DIR` environment variable.
+    """
+    directory = config.get("profile_dir") or os.environ.get(PROFILE_DIR_ENV)
+    return Path(directory) if directory else None
+
+
+class StreamProfiler:
+    """The cProfile sessions of one stream, one profile per thread.
+
+    Sessions nest: the work done in a session of another stream, such as a
+    child stream synced by its parent, is profiled for that stream only.
+    """
+
+    def __init__(self, stream: str) -> None:
+        """Create a profiler without any session yet.
+
+        Args:
+            stream: Name of the stream profiled.
+        """
+        self.stream = stream
+        self._lock = threading.Lock()
+        self._profiles: dict[int, cProfile.Profile] = {}
+
+    def _thread_profile(self) -> cProfile.Profile:
+        thread_id = threading.get_ident()
+        with self._lock:
+            if thread_id not in self._profiles:
+                self._profiles[thread_id] = cProfile.Profile()
+            return self._profiles[thread_id]
+
+    @contextlib.contextmanager
+    def session(self) -> t.Iterator[None]:
+        """Profile the `with` block, unless this stream already is in this thread."""
+        stack: list[cProfile.Profile] = _sessions.__dict__.setdefault("stack", [])
+        profile = self._thread_profile()
+        if stack and stack[-1] is profile:
+            yield
+            return
+
+        if stack:
+            stack[-1].disable()
+        stack.append(profile)
+        enabled = _enable(profile)
+        try:
+            yield
+        finally:
+            if enabled:
+                profile.disable()
+            stack.pop()
+            if stack:
+                _enable(stack[-1])
+
+    def stats(self) -> pstats.Stats | None:
+        """Return the statistics of every session, or None if none ran."""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        stats: pstats.Stats | None = None
+        for profile in profiles:
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        return stats
+
+
+class ProfilerRegistry:
+    """Profilers of every stream of a tap run, written out at the end."""
+
+    def __init__(self, directory: Path) -> None:
+        """Create the registry.
+
+        Args:
+            directory: Where the profiles are written.
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._streams: dict[str, StreamProfiler] = {}
+
+    def stream(self, name: str) -> StreamProfiler:
+        """Return the profiler of stream `name`."""
+        with self._lock:
+            if name not in self._streams:
+                self._streams[name] = StreamProfiler(name)
+            return self._streams[name]
+
+    def write(self) -> None:
+        """Write `<stream>.pstats` and a `<stream>.txt` summary per stream profiled.
+
+        The `.pstats` files load with `pstats`, snakeviz, gprof2dot or
+        flameprof, which renders them as flame graphs.
+        """
+        with self._lock:
+            profilers = list(self._streams.values())
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for profiler in profilers:
+            stats = profiler.stats()
+            if stats is None:
+                continue
+            path = self.directory / f"{profiler.stream}.pstats"
+            stats.dump_stats(path)
+
+            summary = io.StringIO()
+            stats.stream = summary  # type: ignore[attr-defined]
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_FUNCTIONS)
+            path.with_suffix(".txt").write_text(summary.getvalue())
+            logger.info("Wrote the profile of stream '%s' to %s", profiler.stream, path)
@@ -0,0 +1,213 @@
+"""Cache of HubSpot property definitions."""
+
+from __future__ import annotations
+
+import datetime as dt
+import decimal
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import typing as t
+from http import HTTPStatus
+from pathlib import Path
+
+from singer_sdk import typing as th
+
+if t.TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROPERTY_CACHE_TTL = 24 * 60 * 60
+
+_Fetch = t.Callable[[dict[str, str]], "requests.Response"]
+Coercer = t.Callable[[str], t.Any]
+
+
+def _from_epoch_ms(value: str) -> dt.datetime:
+    return dt.datetime.fromtimestamp(int(value) / 1000, tz=dt.timezone.utc)
+
+
+def _unparsable(value: str, kind: str) -> None:
+    # A value that does not parse would not match the column type either.
+    logger.debug("Dropping property value %r, which is not a %s.", value, kind)
+
+
+def _to_number(value: str) -> decimal.Decimal | None:
+    if not value:
+        return None
+    try:
+        number = decimal.Decimal(value)
+    except decimal.InvalidOperation:
+        number = None
+    if number is None or not number.is_finite():
+        _unparsable(value, "number")
+        return None
+    return number
+
+
+def _to_bool(value: str) -> bool | None:
+    if not value:
+        return None
+    parsed = {"true": True, "false": False}.get(value.lower())
+    if parsed is None:
+        _unparsable(value, "boolean")
+    return parsed
+
+
+def _to_date(value: str) -> str | None:
+    if not value:
+        return None
+    return _from_epoch_ms(value).date().isoformat() if value.isdigit() else value
+
+
+def _to_datetime(value: str) -> str | None:
+    if not value:
+        return None
+    return _from_epoch_ms(value).isoformat() if value.isdigit() else value
+
+
+# HubSpot property `type` -> JSON schema type and the coercion of the string
+# values HubSpot returns. Other types, including enumerations, stay strings.
+# https://developers.hubspot.com/docs/api/crm/properties#property-type-and-fieldtype-values
+_PROPERTY_TYPES: dict[str, tuple[type[th.JSONTypeHelper], Coercer]] = {
+    "number": (th.NumberType, _to_number),
+    "bool": (th.BooleanType, _to_bool),
+    "date": (th.DateType, _to_date),
+    "datetime": (th.DateTimeType, _to_datetime),
+}
+
+
+def _property_type(definition: t.Mapping[str, t.Any]) -> str:
+    if definition.get("fieldType") == "booleancheckbox":
+        return "bool"
+    return definition.get("type", "string")
+
+
+def property_datatype(definition: t.Mapping[str, t.Any]) -> th.JSONTypeHelper:
+    """Return the JSON schema type of a HubSpot property definition."""
+    entry = _PROPERTY_TYPES.get(_property_type(definition))
+    return entry[0]() if entry else th.StringType()
+
+
+def compile_coercers(
+    definitions: t.Mapping[str, t.Mapping[str, t.Any]],
+) -> dict[str, Coercer]:
+    """Return the coercion of every non-string property, keyed by name.
+
+    Args:
+        definitions: HubSpot property definitions, keyed by property name.
+
+    Returns:
+        Functions turning the string values HubSpot returns into values
+        matching `property_datatype`.
+    """
+    coercers = {}
+    for name, definition in definitions.items():
+        if entry := _PROPERTY_TYPES.get(_property_type(definition)):
+            coercers[name] = entry[1]
+    return coercers
+
+
+def portal_cache_key(config: t.Mapping[str, t.Any]) -> str:
+    """Return a stable, non-reversible key identifying the portal of `config`."""
+    credential = (
+        config.get("access_token")
+        or config.get("refresh_token")
+        or config.get("client_id")
+        or ""
+    )
+    return hashlib.sha256(credential.encode()).hexdigest()[:16]
+
+
+class PropertyCache:
+    """Property definitions per object type, kept in memory and optionally on disk.
+
+    Entries younger than `ttl` seconds are used as is. Older entries are
+    revalidated with `If-None-Match` when HubSpot sent an `ETag`, so an
+    unchanged property list costs a single empty response.
+    """
+
+    def __init__(
+        self,
+        portal_key: str,
+        cache_dir: str | None = None,
+        ttl: float = DEFAULT_PROPERTY_CACHE_TTL,
+    ) -> None:
+        """Create the cache.
+
+        Args:
+            portal_key: Key separating the entries of different portals.
+            cache_dir: Directory to persist entries in, or None for memory only.
+            ttl: Seconds an entry is used without revalidation.
+        """
+        self.ttl = ttl
+        self._dir = Path(cache_dir) / portal_key if cache_dir else None
+        self._entries: dict[str, dict[str, t.Any]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, object_type: str) -> Path | None:
+        return self._dir / f"{object_type}.json" if self._dir else None
+
+    def _load(self, object_type: str) -> dict[str, t.Any] | None:
+        with self._lock:
+            if object_type in self._entries:
+                return self._entries[object_type]
+        path = self._path(object_type)
+        if not path or not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable property cache file %s", path)
+            return None
+
+    def _store(self, object_type: str, entry: dict[str, t.Any]) -> None:
+        with self._lock:
+            self._entries[object_type] = entry
+        path = self._path(object_type)
+        if not path:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as tmp:
+                json.dump(entry, tmp)
+            Path(tmp_name).replace(path)
+        except OSError:
+            logger.warning("Could not write property cache file %s", path)
+
+    def get(self, object_type: str, fetch: _Fetch) -> list[dict[str, t.Any]]:
+        """Return the property definitions of `object_type`.
+
+        Args:
+            object_type: HubSpot object type, e.g. `contacts`.
+            fetch: Calls the properties endpoint with the given extra headers.
+
+        Returns:
+            The raw property definitions returned by HubSpot.
+        """
+        entry = self._load(object_type)
+        if entry and time.time() - entry["fetched_at"] < self.ttl:
+            return entry["results"]
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        response = fetch(headers)
+
+        if entry and response.status_code == HTTPStatus.NOT_MODIFIED:
+            entry = {**entry, "fetched_at": time.time()}
+        else:
+            response.raise_for_status()
+            entry = {
+                "fetched_at": time.time(),
+                "etag": response.headers.get("ETag"),
+                "results": response.json().get("results", []),
+            }
+        self._store(object_type, entry)
+        return entry["results"]
@@ -0,0 +1,177 @@
+"""Portal-wide rate limiting for HubSpot API requests."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import typing as t
+from urllib.parse import urlparse
+
+if t.TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+# https://developers.hubspot.com/docs/api/usage-details#rate-limits
+HEADER_MAX = "X-HubSpot-RateLimit-Max"
+HEADER_REMAINING = "X-HubSpot-RateLimit-Remaining"
+HEADER_INTERVAL = "X-HubSpot-RateLimit-Interval-Milliseconds"
+HEADER_DAILY = "X-HubSpot-RateLimit-Daily"
+HEADER_DAILY_REMAINING = "X-HubSpot-RateLimit-Daily-Remaining"
+
+DEFAULT_REQUESTS_PER_TEN_SECONDS = 100
+DEFAULT_SEARCH_REQUESTS_PER_SECOND = 4
+DAILY_WARNING_RATIO = 0.1
+
+
+def _int_header(response: requests.Response, name: str) -> int | None:
+    value = response.headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Callers reserve a token with `reserve`, which never blocks and returns how
+    long the caller must wait before sending, so the same bucket can back both
+    threaded and asyncio request paths.
+    """
+
+    def __init__(self, capacity: float, interval: float) -> None:
+        """Create a bucket allowing `capacity` requests every `interval` seconds.
+
+        Args:
+            capacity: Maximum burst size, in requests.
+            interval: Seconds needed to refill an empty bucket.
+        """
+        self._lock = threading.Lock()
+        self.capacity = float(capacity)
+        self.rate = capacity / interval
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._resume_at - now)
+
+    def acquire(self) -> None:
+        """Block the calling thread until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def calibrate(
+        self,
+        capacity: float,
+        interval: float,
+        remaining: float | None = None,
+    ) -> None:
+        """Adjust the bucket to the limits the server reported.
+
+        Args:
+            capacity: Requests allowed per interval.
+            interval: Interval length in seconds.
+            remaining: Requests the server says are left in the current interval.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.capacity = float(capacity)
+            self.rate = capacity / interval
+            self._tokens = min(self._tokens, self.capacity)
+            if remaining is not None:
+                self._tokens = min(self._tokens, float(remaining))
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every reservation for at least `seconds`."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+
+class HubspotRateLimiter:
+    """Rate limiter shared by every stream of a tap run.
+
+    HubSpot budgets CRM search requests separately (and much more tightly)
+    than the rest of the API, so each gets its own bucket.
+    """
+
+    def __init__(
+        self,
+        requests_per_ten_seconds: int = DEFAULT_REQUESTS_PER_TEN_SECONDS,
+        search_requests_per_second: int = DEFAULT_SEARCH_REQUESTS_PER_SECOND,
+    ) -> None:
+        """Create the limiter.
+
+        Args:
+            requests_per_ten_seconds: Starting budget for regular endpoints. This
+                is recalibrated from the `X-HubSpot-RateLimit-*` headers.
+            search_requests_per_second: Budget for the CRM search endpoints.
+        """
+        self.default = TokenBucket(requests_per_ten_seconds, 10)
+        self.search = TokenBucket(search_requests_per_second, 1)
+        self._daily_warned = False
+
+    @staticmethod
+    def is_search(url: str | None) -> bool:
+        """Return whether the URL targets a CRM search endpoint."""
+        if not url:
+            return False
+        return urlparse(url).path.rstrip("/").endswith("/search")
+
+    def bucket_for(self, url: str | None) -> TokenBucket:
+        """Return the bucket that budgets requests to `url`."""
+        return self.search if self.is_search(url) else self.default
+
+    def acquire(self, url: str | None) -> None:
+        """Block until a request to `url` may be sent."""
+        self.bucket_for(url).acquire()
+
+    def update(self, response: requests.Response) -> None:
+        """Calibrate from the rate limit headers and `Retry-After` of a response."""
+        bucket = self.bucket_for(response.request.url if response.request else None)
+
+        limit = _int_header(response, HEADER_MAX)
+        interval_ms = _int_header(response, HEADER_INTERVAL)
+        if limit and interval_ms:
+            bucket.calibrate(
+                limit,
+                interval_ms / 1000,
+                remaining=_int_header(response, HEADER_REMAINING),
+            )
+
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                bucket.pause(float(retry_after))
+            except ValueError:
+                logger.debug("Ignoring unparseable Retry-After: %s", retry_after)
+
+        daily = _int_header(response, HEADER_DAILY)
+        daily_remaining = _int_header(response, HEADER_DAILY_REMAINING)
+        if (
+            daily
+            and daily_remaining is not None
+            and daily_remaining < daily * DAILY_WARNING_RATIO
+            and not self._daily_warned
+        ):
+            self._daily_warned = True
+            logger.warning(
+                "Only %d of %d daily HubSpot API calls remain.",
+                daily_remaining,
+                daily,
+            )
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import functools
 import typing as t
 
 from singer_sdk import typing as th  # JSON Schema typing helpers
 
 from tap_hubspot.client import (
     DynamicIncrementalHubspotStream,
+    HubspotAssociationStream,
     HubspotStream,
 )
+from tap_hubspot.concurrency import iter_in_order
 
 if t.TYPE_CHECKING:
     from singer_sdk.helpers.types import Context
@@ -42,6 +45,7 @@ class ContactStream(DynamicIncrementalHubspotStream):
     primary_keys = ("id",)
     replication_key = "lastmodifieddate"
     replication_method = "INCREMENTAL"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
     @property
@@ -1142,42 +1146,51 @@ class PropertyNotesStream(HubspotStream):
         """Returns an updated path which includes the api version."""
         return "https://api.hubapi.com/crm/v3"
 
+    property_stream_types: t.ClassVar[list[type[HubspotStream]]] = [
+        PropertyTicketStream,
+        PropertyDealStream,
+        PropertyContactStream,
+        PropertyCompanyStream,
+        PropertyProductStream,
+        PropertyLineItemStream,
+        PropertyEmailStream,
+        PropertyPostalMailStream,
+        PropertyCallStream,
+        PropertyGoalStream,
+        PropertyMeetingStream,
+        PropertyTaskStream,
+        PropertyCommunicationStream,
+    ]
+
+    def _get_object_records(
+        self,
+        stream_type: type[HubspotStream] | None,
+        context: Context | None,
+    ) -> t.Iterable[dict[str, t.Any]]:
+        """Yield the properties of one object type, tagged with that type."""
+        if stream_type is None:
+            path, records = self.path, super().get_records(context)
+        else:
+            stream = stream_type(self._tap, schema={"properties": {}})
+            path, records = stream.path, stream.get_records(context)
+        hubspot_object = path.rsplit("/", 1)[-1]
+        for record in records:
+            record["hubspot_object"] = hubspot_object
+            yield record
+
     def get_records(self, context: Context | None) -> t.Iterable[dict[str, t.Any]]:
-        """Merges all the property stream data into a single property table."""
-        property_ticket = PropertyTicketStream(self._tap, schema={"properties": {}})
-        property_deal = PropertyDealStream(self._tap, schema={"properties": {}})
-        property_contact = PropertyContactStream(self._tap, schema={"properties": {}})
-        property_company = PropertyCompanyStream(self._tap, schema={"properties": {}})
-        property_product = PropertyProductStream(self._tap, schema={"properties": {}})
-        property_lineitem = PropertyLineItemStream(self._tap, schema={"properties": {}})
-        property_email = PropertyEmailStream(self._tap, schema={"properties": {}})
-        property_postalmail = PropertyPostalMailStream(
-            self._tap,
-            schema={"properties": {}},
-        )
-        property_call = PropertyCallStream(self._tap, schema={"properties": {}})
-        property_goal = PropertyGoalStream(self._tap, schema={"properties": {}})
-        property_meeting = PropertyMeetingStream(self._tap, schema={"properties": {}})
-        property_task = PropertyTaskStream(self._tap, schema={"properties": {}})
-        property_communication = PropertyCommunicationStream(
-            self._tap,
-            schema={"properties": {}},
-        )
-        return (
-            list(property_ticket.get_records(context))
-            + list(property_deal.get_records(context))
-            + list(property_contact.get_records(context))
-            + list(property_company.get_records(context))
-            + list(property_product.get_records(context))
-            + list(property_lineitem.get_records(context))
-            + list(property_email.get_records(context))
-            + list(property_postalmail.get_records(context))
-            + list(property_call.get_records(context))
-            + list(property_goal.get_records(context))
-            + list(property_meeting.get_records(context))
-            + list(property_task.get_records(context))
-            + list(property_communication.get_records(context))
-            + list(super().get_records(context))
+        """Merges all the property stream data into a single property table.
+
+        Records are streamed as each endpoint is paged, fetching up to
+        `max_parallel_property_endpoints` endpoints at once.
+        """
+        producers = [
+            functools.partial(self._get_object_records, stream_type, context)
+            for stream_type in [*self.property_stream_types, None]
+        ]
+        yield from iter_in_order(
+            producers,
+            max_workers=self.config.get("max_parallel_property_endpoints") or 1,
         )
 
 
@@ -1198,6 +1211,7 @@ class CompanyStream(DynamicIncrementalHubspotStream):
     primary_keys = ("id",)
     replication_key = "hs_lastmodifieddate"
     replication_method = "INCREMENTAL"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
     @property
@@ -1224,6 +1238,7 @@ class DealStream(DynamicIncrementalHubspotStream):
     primary_keys = ("id",)
     replication_key = "hs_lastmodifieddate"
     replication_method = "INCREMENTAL"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
     @property
@@ -1232,7 +1247,7 @@ class DealStream(DynamicIncrementalHubspotStream):
         return "https://api.hubapi.com/crm/v3"
 
 
-class FeedbackSubmissionsStream(HubspotStream):
+class FeedbackSubmissionsStream(DynamicIncrementalHubspotStream):
     """https://developers.hubspot.com/docs/api/crm/feedback-submissions."""
 
     """
@@ -1246,29 +1261,12 @@ class FeedbackSubmissionsStream(HubspotStream):
 
     name = "feedback_submissions"
     path = "/objects/feedback_submissions"
+    incremental_path = "/objects/feedback_submissions/search"
     primary_keys = ("id",)
+    replication_key = "hs_lastmodifieddate"
+    replication_method = "INCREMENTAL"
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
-    schema = PropertiesList(
-        Property("id", StringType),
-        Property(
-            "properties",
-            ObjectType(
-                Property("city", StringType),
-                Property("createdDate", StringType),
-                Property("domain", StringType),
-                Property("hs_lastmodifieddate", StringType),
-                Property("industry", StringType),
-                Property("name", StringType),
-                Property("phone", StringType),
-                Property("state", StringType),
-            ),
-        ),
-        Property("createdAt", StringType),
-        Property("updatedAt", StringType),
-        Property("archived", BooleanType),
-    ).to_dict()
-
     @property
     def url_base(self) -> str:
         """Returns an updated path which includes the api version."""
@@ -1301,7 +1299,7 @@ class LineItemStream(DynamicIncrementalHubspotStream):
         return "https://api.hubapi.com/crm/v3"
 
 
-class ProductStream(HubspotStream):
+class ProductStream(DynamicIncrementalHubspotStream):
     """https://developers.hubspot.com/docs/api/crm/products."""
 
     """
@@ -1315,36 +1313,19 @@ class ProductStream(HubspotStream):
 
     name = "products"
     path = "/objects/products"
+    incremental_path = "/objects/products/search"
     primary_keys = ("id",)
+    replication_key = "hs_lastmodifieddate"
+    replication_method = "INCREMENTAL"
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
-    schema = PropertiesList(
-        Property("id", StringType),
-        Property(
-            "properties",
-            ObjectType(
-                Property("createdate", StringType),
-                Property("description", StringType),
-                Property("hs_cost_of_goods_sold", StringType),
-                Property("hs_lastmodifieddate", StringType),
-                Property("hs_recurring_billing_period", StringType),
-                Property("hs_sku", StringType),
-                Property("name", StringType),
-                Property("price", StringType),
-            ),
-        ),
-        Property("createdAt", StringType),
-        Property("updatedAt", StringType),
-        Property("archived", BooleanType),
-    ).to_dict()
-
     @property
     def url_base(self) -> str:
         """Returns an updated path which includes the api version."""
         return "https://api.hubapi.com/crm/v3"
 
 
-class TicketStream(HubspotStream):
+class TicketStream(DynamicIncrementalHubspotStream):
     """https://developers.hubspot.com/docs/api/crm/tickets."""
 
     """
@@ -1358,35 +1339,19 @@ class TicketStream(HubspotStream):
 
     name = "tickets"
     path = "/objects/tickets"
+    incremental_path = "/objects/tickets/search"
     primary_keys = ("id",)
+    replication_key = "hs_lastmodifieddate"
+    replication_method = "INCREMENTAL"
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
-    schema = PropertiesList(
-        Property("id", StringType),
-        Property(
-            "properties",
-            ObjectType(
-                Property("createdate", StringType),
-                Property("hs_lastmodifieddate", StringType),
-                Property("hs_pipeline", StringType),
-                Property("hs_pipeline_stage", StringType),
-                Property("hs_ticket_priority", StringType),
-                Property("hubspot_owner_id", StringType),
-                Property("subject", StringType),
-            ),
-        ),
-        Property("createdAt", StringType),
-        Property("updatedAt", StringType),
-        Property("archived", BooleanType),
-    ).to_dict()
-
     @property
     def url_base(self) -> str:
         """Returns an updated path which includes the api version."""
         return "https://api.hubapi.com/crm/v3"
 
 
-class QuoteStream(HubspotStream):
+class QuoteStream(DynamicIncrementalHubspotStream):
     """https://developers.hubspot.com/docs/api/crm/quotes.
 
     name: stream name
@@ -1399,29 +1364,12 @@ class QuoteStream(HubspotStream):
 
     name = "quotes"
     path = "/objects/quotes"
+    incremental_path = "/objects/quotes/search"
     primary_keys = ("id",)
+    replication_key = "hs_lastmodifieddate"
+    replication_method = "INCREMENTAL"
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
-    schema = PropertiesList(
-        Property("id", StringType),
-        Property(
-            "properties",
-            ObjectType(
-                Property("hs_createdate", StringType),
-                Property("hs_expiration_date", StringType),
-                Property("hs_quote_amount", StringType),
-                Property("hs_quote_number", StringType),
-                Property("hs_status", StringType),
-                Property("hs_terms", StringType),
-                Property("hs_title", StringType),
-                Property("hubspot_owner_id", StringType),
-            ),
-        ),
-        Property("createdAt", StringType),
-        Property("updatedAt", StringType),
-        Property("archived", BooleanType),
-    ).to_dict()
-
     @property
     def url_base(self) -> str:
         """Returns an updated path which includes the api version."""
@@ -1470,6 +1418,7 @@ class CallStream(DynamicIncrementalHubspotStream):
     primary_keys = ("id",)
     replication_key = "hs_lastmodifieddate"
     replication_method = "INCREMENTAL"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
     @property
@@ -1495,6 +1444,7 @@ class CommunicationStream(DynamicIncrementalHubspotStream):
     primary_keys = ("id",)
     replication_key = "hs_lastmodifieddate"
     replication_method = "INCREMENTAL"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
     @property
@@ -1511,29 +1461,17 @@ class EmailStream(DynamicIncrementalHubspotStream):
     incremental_path = "/objects/emails/search"
     primary_keys = ("id",)
     replication_key = "hs_lastmodifieddate"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
-    fields_to_ignore = ['hs_body_preview', 'hs_body_preview_html', 'hs_email_text', 'hs_email_html', 'hs_email_headers']
+    # Email bodies make up most of the payload and are rarely needed.
+    excluded_properties = (
+        "hs_body_preview",
+        "hs_body_preview_html",
+        "hs_email_text",
+        "hs_email_html",
+        "hs_email_headers",
+    )
 
-    # add parse_response method to parse the response
-    def parse_response(self, response: requests.Response, **kwargs) -> t.Any:
-        """Parse the response from the API.
-
-        Args:
-            response: The response from the API.
-            kwargs: Additional keyword arguments.
-
-        Returns:
-            The parsed response.
-        """
-        response_json = response.json()
-        results = response_json.get("results", [])
-        new_results = []
-        for result in results:
-            for field in self.fields_to_ignore:
-                result['properties'].pop(field, None)
-            new_results.append(result)
-        return new_results
-        
     @property
     def url_base(self) -> str:
         """Returns an updated path which includes the api version."""
@@ -1557,6 +1495,7 @@ class MeetingStream(DynamicIncrementalHubspotStream):
     primary_keys = ("id",)
     replication_key = "hs_lastmodifieddate"
     replication_method = "INCREMENTAL"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
     @property
@@ -1582,6 +1521,7 @@ class NoteStream(DynamicIncrementalHubspotStream):
     primary_keys = ("id",)
     replication_key = "hs_lastmodifieddate"
     replication_method = "INCREMENTAL"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
     @property
@@ -1607,6 +1547,7 @@ class PostalMailStream(DynamicIncrementalHubspotStream):
     primary_keys = ("id",)
     replication_key = "hs_lastmodifieddate"
     replication_method = "INCREMENTAL"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
     @property
@@ -1632,9 +1573,78 @@ class TaskStream(DynamicIncrementalHubspotStream):
     primary_keys = ("id",)
     replication_key = "hs_lastmodifieddate"
     replication_method = "INCREMENTAL"
+    has_archived_records = True
     records_jsonpath = "$[results][*]"  # Or override `parse_response`.
 
     @property
     def url_base(self) -> str:
         """Returns an updated path which includes the api version."""
         return "https://api.hubapi.com/crm/v3"
+
+
+class ContactAssociationsStream(HubspotAssociationStream):
+    """https://developers.hubspot.com/docs/api/crm/associations."""
+
+    name = "contact_associations"
+    parent_stream_type = ContactStream
+    to_object_types = ("companies", "deals")
+
+
+class CompanyAssociationsStream(HubspotAssociationStream):
+    """https://developers.hubspot.com/docs/api/crm/associations."""
+
+    name = "company_associations"
+    parent_stream_type = CompanyStream
+    to_object_types = ("contacts", "deals")
+
+
+class DealAssociationsStream(HubspotAssociationStream):
+    """https://developers.hubspot.com/docs/api/crm/associations."""
+
+    name = "deal_associations"
+    parent_stream_type = DealStream
+    to_object_types = ("contacts", "companies")
+
+
+# Engagements are associated with the records they were logged against.
+ENGAGEMENT_TARGETS = ("contacts", "companies", "deals")
+
+
+class CallAssociationsStream(HubspotAssociationStream):
+    """https://developers.hubspot.com/docs/api/crm/associations."""
+
+    name = "call_associations"
+    parent_stream_type = CallStream
+    to_object_types = ENGAGEMENT_TARGETS
+
+
+class CommunicationAssociationsStream(HubspotAssociationStream):
+    """https://developers.hubspot.com/docs/api/crm/associations."""
+
+    name = "communication_associations"
+    parent_stream_type = CommunicationStream
+    to_object_types = ENGAGEMENT_TARGETS
+
+
+class EmailAssociationsStream(HubspotAssociationStream):
+    """https://developers.hubspot.com/docs/api/crm/associations."""
+
+    name = "email_associations"
+    parent_stream_type = EmailStream
+    to_object_types = ENGAGEMENT_TARGETS
+
+
+class MeetingAssociationsStream(HubspotAssociationStream):
+    """https://developers.hubspot.com/docs/api/crm/associations."""
+
+    name = "meeting_associations"
+    parent_stream_type = MeetingStream
+    to_object_types = ENGAGEMENT_TARGETS
+
+
+class NoteAssociationsStream(HubspotAssociationStream):
+    """https://developers.hubspot.com/docs/api/crm/associations."""
+
+    name = "note_associations"
+    parent_stream_type = NoteStream
+    to_object_types = ENGAGEMENT_TARGETS
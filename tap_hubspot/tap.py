@@ -2,10 +2,45 @@
 
 from __future__ import annotations
 
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
 from singer_sdk import Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
+from singer_sdk._singerlib import StateMessage
+from urllib3.util import Retry
 
 from tap_hubspot import streams
+from tap_hubspot.aio import DEFAULT_MAX_REQUESTS_IN_FLIGHT, AsyncRequestEngine
+from tap_hubspot.auth import DEFAULT_TOKEN_REFRESH_MARGIN, OAuthTokenManager
+from tap_hubspot.client import (
+    DEFAULT_CHECKPOINT_INTERVAL_RECORDS,
+    DEFAULT_CHECKPOINT_INTERVAL_SECONDS,
+)
+from tap_hubspot.instrumentation import DEFAULT_METRICS_INTERVAL, MetricsRegistry
+from tap_hubspot.profiling import ProfilerRegistry, profile_dir
+from tap_hubspot.properties import (
+    DEFAULT_PROPERTY_CACHE_TTL,
+    PropertyCache,
+    portal_cache_key,
+)
+from tap_hubspot.ratelimit import (
+    DEFAULT_REQUESTS_PER_TEN_SECONDS,
+    DEFAULT_SEARCH_REQUESTS_PER_SECOND,
+    HubspotRateLimiter,
+)
+
+if t.TYPE_CHECKING:
+    from singer_sdk._singerlib import Message
+    from singer_sdk.streams import Stream
+
+
+DISCOVERY_WORKERS = 8
+DEFAULT_HTTP_POOL_SIZE = 32
+DEFAULT_HTTP_MAX_RETRIES = 3
 
 
 class TapHubspot(Tap):
@@ -38,6 +73,24 @@ class TapHubspot(Tap):
             required=False,
             description="The OAuth app refresh token.",
         ),
+        th.Property(
+            "token_refresh_margin",
+            th.IntegerType,
+            default=DEFAULT_TOKEN_REFRESH_MARGIN,
+            description=(
+                "Seconds before its expiry an OAuth access token is refreshed, "
+                "while requests keep using it."
+            ),
+        ),
+        th.Property(
+            "token_cache_path",
+            th.StringType,
+            description=(
+                "File to cache the OAuth access token in between runs, so runs "
+                "shortly after one another reuse it. The file holds a live "
+                "credential. Tokens are only kept in memory when unset."
+            ),
+        ),
         th.Property(
             "start_date",
             th.DateTimeType,
@@ -46,40 +99,477 @@ class TapHubspot(Tap):
         th.Property(
             "end_date",
             th.DateTimeType,
-            description="Latest record date to sync",
+            description=(
+                "Date records are synced up to, exclusive, by their replication key"
+            ),
+        ),
+        th.Property(
+            "archived_records",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Also emit the contacts, companies, deals and engagements archived "
+                "since the previous sync, with `archived` set. They are bookmarked "
+                "separately, on their `archivedAt`."
+            ),
+        ),
+        th.Property(
+            "max_parallel_streams",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Maximum number of top-level streams to sync concurrently. "
+                "Singer messages are still written to stdout one at a time."
+            ),
+        ),
+        th.Property(
+            "requests_per_ten_seconds",
+            th.IntegerType,
+            default=DEFAULT_REQUESTS_PER_TEN_SECONDS,
+            description=(
+                "Starting request budget per 10 seconds, shared by all streams. "
+                "Recalibrated from HubSpot's rate limit response headers."
+            ),
+        ),
+        th.Property(
+            "search_requests_per_second",
+            th.IntegerType,
+            default=DEFAULT_SEARCH_REQUESTS_PER_SECOND,
+            description="Request budget per second for the CRM search endpoints.",
+        ),
+        th.Property(
+            "max_parallel_search_windows",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Maximum number of time windows fetched concurrently by "
+                "incremental search syncs."
+            ),
+        ),
+        th.Property(
+            "max_parallel_property_endpoints",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Maximum number of object types whose property definitions the "
+                "properties stream fetches concurrently."
+            ),
+        ),
+        th.Property(
+            "checkpoint_interval_records",
+            th.IntegerType,
+            default=DEFAULT_CHECKPOINT_INTERVAL_RECORDS,
+            description=(
+                "Records between resumable STATE checkpoints of incremental "
+                "search syncs. 0 disables record-based checkpoints."
+            ),
+        ),
+        th.Property(
+            "checkpoint_interval_seconds",
+            th.IntegerType,
+            default=DEFAULT_CHECKPOINT_INTERVAL_SECONDS,
+            description=(
+                "Seconds between resumable STATE checkpoints of incremental "
+                "search syncs. 0 disables time-based checkpoints."
+            ),
+        ),
+        th.Property(
+            "batch_read_hydration",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Page through CRM object ids only, then fetch full records with "
+                "the batch/read endpoints."
+            ),
+        ),
+        th.Property(
+            "batch_read_workers",
+            th.IntegerType,
+            default=1,
+            description="Maximum number of concurrent batch/read requests per stream.",
+        ),
+        th.Property(
+            "association_read_workers",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Maximum number of concurrent association batch/read requests per "
+                "association stream."
+            ),
+        ),
+        th.Property(
+            "property_cache_dir",
+            th.StringType,
+            description=(
+                "Directory to cache HubSpot property definitions in between runs. "
+                "Definitions are only cached in memory when unset."
+            ),
+        ),
+        th.Property(
+            "property_cache_ttl",
+            th.IntegerType,
+            default=DEFAULT_PROPERTY_CACHE_TTL,
+            description=(
+                "Seconds a cached property definition is used before it is "
+                "revalidated with HubSpot."
+            ),
+        ),
+        th.Property(
+            "http_pool_size",
+            th.IntegerType,
+            default=DEFAULT_HTTP_POOL_SIZE,
+            description=(
+                "Maximum number of keep-alive connections to the HubSpot API, "
+                "shared by all streams."
+            ),
+        ),
+        th.Property(
+            "http_max_retries",
+            th.IntegerType,
+            default=DEFAULT_HTTP_MAX_RETRIES,
+            description="Retries for requests that fail to connect to HubSpot.",
+        ),
+        th.Property(
+            "prefetch_pages",
+            th.IntegerType,
+            default=0,
+            description=(
+                "Pages of records requested ahead of the records being processed. "
+                "Each stream buffers at most this many pages."
+            ),
+        ),
+        th.Property(
+            "async_http",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Send requests from an asyncio event loop shared by all streams, "
+                "fetching pages ahead of the records being processed."
+            ),
+        ),
+        th.Property(
+            "max_requests_in_flight",
+            th.IntegerType,
+            default=DEFAULT_MAX_REQUESTS_IN_FLIGHT,
+            description=(
+                "Maximum number of requests awaiting a response at once, across "
+                "all streams, when `async_http` is enabled."
+            ),
+        ),
+        th.Property(
+            "typed_properties",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Type numbers, dates and booleans after their HubSpot property "
+                "definition. When false, every property is a string."
+            ),
+        ),
+        th.Property(
+            "fast_record_conformance",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Conform records with a conformer compiled once per stream "
+                "instead of walking the schema for every record."
+            ),
+        ),
+        th.Property(
+            "stream_properties",
+            th.ObjectType(
+                additional_properties=th.ObjectType(
+                    th.Property("include", th.ArrayType(th.StringType)),
+                    th.Property("exclude", th.ArrayType(th.StringType)),
+                ),
+            ),
+            description=(
+                "HubSpot properties to request per stream name, as `include` "
+                "and/or `exclude` lists. Properties left out are never requested."
+            ),
+        ),
+        th.Property(
+            "metrics_interval_seconds",
+            th.NumberType,
+            default=DEFAULT_METRICS_INTERVAL,
+            description=(
+                "Seconds between two logs of a stream's request, throughput and "
+                "pipeline stage metrics. They are logged once more at the end of "
+                "the sync."
+            ),
+        ),
+        th.Property(
+            "metrics_textfile",
+            th.StringType,
+            description=(
+                "Path of a Prometheus textfile to write the stream metrics to, "
+                "each time they are logged."
+            ),
+        ),
+        th.Property(
+            "profile_dir",
+            th.StringType,
+            description=(
+                "Profile each stream with cProfile and write the profiles to this "
+                "directory at the end of the sync. Also set by the "
+                "`TAP_HUBSPOT_PROFILE_DIR` environment variable."
+            ),
         ),
     ).to_dict()
 
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:  # noqa: D107
+        # Guards stdout and the shared state dict when streams sync concurrently.
+        self.message_lock = threading.RLock()
+        # Shared clients are built on first use: streams, and with them the
+        # first API calls, may already be created inside `super().__init__`.
+        self._shared_lock = threading.Lock()
+        self._rate_limiter: HubspotRateLimiter | None = None
+        self._property_cache: PropertyCache | None = None
+        self._http_session: requests.Session | None = None
+        self._http_engine: AsyncRequestEngine | None = None
+        self._metrics_registry: MetricsRegistry | None = None
+        self._profiler_registry: ProfilerRegistry | None = None
+        self._oauth_token_manager: OAuthTokenManager | None = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def rate_limiter(self) -> HubspotRateLimiter:
+        """Return the rate limiter shared by every stream."""
+        with self._shared_lock:
+            if self._rate_limiter is None:
+                self._rate_limiter = HubspotRateLimiter(
+                    requests_per_ten_seconds=self.config.get(
+                        "requests_per_ten_seconds",
+                        DEFAULT_REQUESTS_PER_TEN_SECONDS,
+                    ),
+                    search_requests_per_second=self.config.get(
+                        "search_requests_per_second",
+                        DEFAULT_SEARCH_REQUESTS_PER_SECOND,
+                    ),
+                )
+            return self._rate_limiter
+
+    @property
+    def property_cache(self) -> PropertyCache:
+        """Return the property definition cache shared by every stream."""
+        with self._shared_lock:
+            if self._property_cache is None:
+                self._property_cache = PropertyCache(
+                    portal_cache_key(self.config),
+                    cache_dir=self.config.get("property_cache_dir"),
+                    ttl=self.config.get(
+                        "property_cache_ttl",
+                        DEFAULT_PROPERTY_CACHE_TTL,
+                    ),
+                )
+            return self._property_cache
+
+    @property
+    def oauth_token_manager(self) -> OAuthTokenManager:
+        """Return the OAuth access tokens shared by every stream."""
+        session = self.http_session
+        with self._shared_lock:
+            if self._oauth_token_manager is None:
+                self._oauth_token_manager = OAuthTokenManager(
+                    self.config,
+                    session,
+                    refresh_margin=self.config.get(
+                        "token_refresh_margin",
+                        DEFAULT_TOKEN_REFRESH_MARGIN,
+                    ),
+                    cache_path=self.config.get("token_cache_path"),
+                )
+            return self._oauth_token_manager
+
+    @property
+    def metrics_registry(self) -> MetricsRegistry:
+        """Return the measurements of every stream."""
+        with self._shared_lock:
+            if self._metrics_registry is None:
+                self._metrics_registry = MetricsRegistry(
+                    interval=self.config.get(
+                        "metrics_interval_seconds",
+                        DEFAULT_METRICS_INTERVAL,
+                    ),
+                    textfile=self.config.get("metrics_textfile"),
+                )
+            return self._metrics_registry
+
+    @property
+    def profiler_registry(self) -> ProfilerRegistry | None:
+        """Return the profilers of every stream, or None unless profiling."""
+        directory = profile_dir(self.config)
+        if directory is None:
+            return None
+        with self._shared_lock:
+            if self._profiler_registry is None:
+                self._profiler_registry = ProfilerRegistry(directory)
+            return self._profiler_registry
+
+    @property
+    def http_session(self) -> requests.Session:
+        """Return the pooled HTTP session shared by every stream."""
+        with self._shared_lock:
+            if self._http_session is None:
+                pool_size = self.config.get("http_pool_size", DEFAULT_HTTP_POOL_SIZE)
+                max_retries = self.config.get(
+                    "http_max_retries",
+                    DEFAULT_HTTP_MAX_RETRIES,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=pool_size,
+                    pool_maxsize=pool_size,
+                    # Only connection failures are retried here; HTTP errors are
+                    # retried by the stream so they go through the rate limiter,
+                    # and any other error, such as an SSL one, raises at once.
+                    max_retries=Retry(
+                        total=max_retries,
+                        connect=max_retries,
+                        read=0,
+                        status=0,
+                        other=0,
+                        backoff_factor=0.5,
+                    ),
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._http_session = session
+            return self._http_session
+
+    @property
+    def http_engine(self) -> AsyncRequestEngine | None:
+        """Return the asyncio request engine, or None unless `async_http` is set."""
+        if not self.config.get("async_http"):
+            return None
+        session, rate_limiter = self.http_session, self.rate_limiter
+        with self._shared_lock:
+            if self._http_engine is None:
+                self._http_engine = AsyncRequestEngine(
+                    session,
+                    rate_limiter,
+                    max_in_flight=self.config.get(
+                        "max_requests_in_flight",
+                        DEFAULT_MAX_REQUESTS_IN_FLIGHT,
+                    ),
+                )
+            return self._http_engine
+
     def discover_streams(self) -> list[streams.HubspotStream]:
         """Return a list of discovered streams.
 
+        Dynamic streams load their property definitions while being built, so
+        the streams are built concurrently.
+
         Returns:
             A list of discovered streams.
         """
-        return [
-            streams.ContactStream(self),
-            streams.UsersStream(self),
-            streams.OwnersStream(self),
-            # streams.TicketPipelineStream(self),
-            streams.DealPipelineStream(self),
-            # streams.EmailSubscriptionStream(self),
-            streams.PropertyNotesStream(self),
-            streams.CompanyStream(self),
-            streams.DealStream(self),
-            # streams.FeedbackSubmissionsStream(self),
-            streams.LineItemStream(self),
-            streams.ProductStream(self),
-            # streams.TicketStream(self),
-            streams.QuoteStream(self),
-            streams.GoalStream(self),
-            streams.CallStream(self),
-            streams.CommunicationStream(self),
-            streams.EmailStream(self),
-            streams.MeetingStream(self),
-            streams.NoteStream(self),
-            # streams.PostalMailStream(self),
-            # streams.TaskStream(self),
+        stream_types: list[type[streams.HubspotStream]] = [
+            streams.ContactStream,
+            streams.UsersStream,
+            streams.OwnersStream,
+            # streams.TicketPipelineStream,
+            streams.DealPipelineStream,
+            # streams.EmailSubscriptionStream,
+            streams.PropertyNotesStream,
+            streams.CompanyStream,
+            streams.DealStream,
+            # streams.FeedbackSubmissionsStream,
+            streams.LineItemStream,
+            streams.ProductStream,
+            # streams.TicketStream,
+            streams.QuoteStream,
+            streams.GoalStream,
+            streams.CallStream,
+            streams.CommunicationStream,
+            streams.EmailStream,
+            streams.MeetingStream,
+            streams.NoteStream,
+            # streams.PostalMailStream,
+            # streams.TaskStream,
+            streams.ContactAssociationsStream,
+            streams.CompanyAssociationsStream,
+            streams.DealAssociationsStream,
+            streams.CallAssociationsStream,
+            streams.CommunicationAssociationsStream,
+            streams.EmailAssociationsStream,
+            streams.MeetingAssociationsStream,
+            streams.NoteAssociationsStream,
         ]
+        with ThreadPoolExecutor(
+            max_workers=DISCOVERY_WORKERS,
+            thread_name_prefix=self.name,
+        ) as executor:
+            return list(
+                executor.map(lambda stream_type: stream_type(self), stream_types),
+            )
+
+    def write_message(self, message: Message) -> None:
+        """Write a Singer message to stdout, one message at a time.
+
+        Args:
+            message: The message to write.
+        """
+        with self.message_lock:
+            super().write_message(message)
+
+    def sync_all(self) -> None:  # type: ignore[misc]
+        """Sync all streams, then report their metrics and write their profiles."""
+        try:
+            self._sync_all_streams()
+        finally:
+            self.metrics_registry.report()
+            if profiler_registry := self.profiler_registry:
+                profiler_registry.write()
+            with self._shared_lock:
+                http_engine, self._http_engine = self._http_engine, None
+            if http_engine is not None:
+                http_engine.close()
+
+    def _sync_all_streams(self) -> None:
+        """Sync all streams, running up to `max_parallel_streams` at once."""
+        max_workers = self.config.get("max_parallel_streams") or 1
+        if max_workers <= 1:
+            super().sync_all()
+            return
+
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        self.write_message(StateMessage(value=self.state))
+
+        to_sync: list[Stream] = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+                continue
+            # Create each bookmark entry up front, child streams' included, so
+            # worker threads only ever mutate their own stream's state.
+            with self.message_lock:
+                _ = stream.stream_state
+            if stream.parent_stream_type:
+                # Child streams are synced by their parent.
+                continue
+            to_sync.append(stream)
+
+        self.logger.info(
+            "Syncing %d streams with up to %d workers.",
+            len(to_sync),
+            max_workers,
+        )
+        with ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=self.name,
+        ) as executor:
+            futures = [executor.submit(self._sync_stream, s) for s in to_sync]
+            for future in as_completed(futures):
+                future.result()
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
+    @staticmethod
+    def _sync_stream(stream: Stream) -> None:
+        stream.sync()
+        stream.finalize_state_progress_markers()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,254 @@
 """Test Configuration."""
 
 from __future__ import annotations
+
+import datetime
+import json
+import threading
+import typing as t
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from tap_hubspot.tap import TapHubspot
+
+START_DATE = "2024-01-01T00:00:00Z"
+BASE_MS = 1704067200000
+PROPERTIES = [
+    {"name": "hs_lastmodifieddate", "type": "datetime", "fieldType": "date"},
+    {"name": "lastmodifieddate", "type": "datetime", "fieldType": "date"},
+    {"name": "email", "type": "string", "fieldType": "text"},
+]
+
+
+def iso(epoch_ms: int) -> str:
+    """Return `epoch_ms` formatted the way HubSpot formats datetimes."""
+    moment = datetime.datetime.fromtimestamp(epoch_ms / 1000, datetime.timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class FakeHubspot:
+    """A small HubSpot portal, served in place of api.hubapi.com.
+
+    `objects` holds the records of each object type as `(id, modified_ms)`
+    pairs and `archived` the archived ones as `(id, archived_ms)` pairs.
+    Every record is associated with `associations_per_record` records of
+    each other type, `association_page_size` at a time.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty portal."""
+        self.objects: dict[str, list[tuple[str, int]]] = {}
+        self.archived: dict[str, list[tuple[str, int]]] = {}
+        self.associations_per_record = 0
+        self.association_page_size = 500
+        self.requests: list[tuple[str, str, dict[str, t.Any]]] = []
+        self._lock = threading.Lock()
+
+    def add_records(self, object_type: str, count: int, step_ms: int = 1000) -> None:
+        """Add `count` records of `object_type`, modified `step_ms` apart."""
+        rows = self.objects.setdefault(object_type, [])
+        first = len(rows) + 1
+        rows.extend(
+            (str(record_id), BASE_MS + record_id * step_ms)
+            for record_id in range(first, first + count)
+        )
+
+    def requests_to(self, path: str) -> list[dict[str, t.Any]]:
+        """Return the bodies or query strings of the requests sent to `path`."""
+        with self._lock:
+            return [body for _, sent_to, body in self.requests if sent_to == path]
+
+    def send(self, request: requests.PreparedRequest, **_: t.Any) -> requests.Response:
+        """Answer `request` as HubSpot would."""
+        url = urlparse(str(request.url))
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        body: dict[str, t.Any] = json.loads(request.body) if request.body else query
+        with self._lock:
+            self.requests.append((str(request.method), url.path, body))
+
+        parts = url.path.strip("/").split("/")
+        payload: dict[str, t.Any] = {"results": []}
+        if parts[:3] == ["crm", "v3", "properties"]:
+            payload = {"results": PROPERTIES}
+        elif parts[:3] == ["crm", "v3", "objects"]:
+            object_type, action = parts[3], parts[4:]
+            if action == ["search"]:
+                payload = self._search(object_type, body)
+            elif action == ["batch", "read"]:
+                payload = self._batch_read(object_type, body)
+            elif not action:
+                payload = self._list(object_type, query)
+        elif parts[:3] == ["crm", "v4", "associations"]:
+            payload = self._read_associations(body)
+        elif parts[:3] == ["crm", "v4", "objects"]:
+            payload = self._associations_page(int(query["after"]))
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(payload).encode()  # noqa: SLF001
+        response.request = request
+        response.url = str(request.url)
+        response.elapsed = datetime.timedelta(0)
+        return response
+
+    @staticmethod
+    def _record(record_id: str, modified_ms: int) -> dict[str, t.Any]:
+        return {
+            "id": record_id,
+            "properties": {
+                "hs_lastmodifieddate": iso(modified_ms),
+                "lastmodifieddate": iso(modified_ms),
+                "email": f"{record_id}@example.com",
+            },
+            "createdAt": iso(BASE_MS),
+            "updatedAt": iso(modified_ms),
+            "archived": False,
+        }
+
+    def _search(self, object_type: str, body: dict[str, t.Any]) -> dict[str, t.Any]:
+        rows = self.objects.get(object_type, [])
+        for search_filter in body["filterGroups"][0]["filters"]:
+            value = int(search_filter["value"])
+            by_id = search_filter["propertyName"] == "hs_object_id"
+            rows = [
+                row
+                for row in rows
+                if {
+                    "GT": lambda a, v=value: a > v,
+                    "GTE": lambda a, v=value: a >= v,
+                    "LT": lambda a, v=value: a < v,
+                }[search_filter["operator"]](int(row[0]) if by_id else row[1])
+            ]
+        by_id = body["sorts"][0]["propertyName"] == "hs_object_id"
+        rows = sorted(rows, key=lambda row: int(row[0]) if by_id else row[1])
+        after = int(body.get("after", 0))
+        page = rows[after : after + body["limit"]]
+        payload: dict[str, t.Any] = {
+            "total": len(rows),
+            "results": [self._record(*row) for row in page],
+        }
+        if after + body["limit"] < len(rows):
+            payload["paging"] = {"next": {"after": str(after + body["limit"])}}
+        return payload
+
+    def _list(self, object_type: str, query: dict[str, str]) -> dict[str, t.Any]:
+        after = int(query.get("after", 0))
+        limit = int(query.get("limit", 100))
+        if query.get("archived") == "true":
+            rows = self.archived.get(object_type, [])
+            results = [
+                {
+                    **self._record(record_id, archived_ms),
+                    "archived": True,
+                    "archivedAt": iso(archived_ms),
+                }
+                for record_id, archived_ms in rows[after : after + limit]
+            ]
+        else:
+            rows = self.objects.get(object_type, [])
+            results = [self._record(*row) for row in rows[after : after + limit]]
+        payload: dict[str, t.Any] = {"results": results}
+        if after + limit < len(rows):
+            payload["paging"] = {"next": {"after": str(after + limit)}}
+        return payload
+
+    def _batch_read(self, object_type: str, body: dict[str, t.Any]) -> dict[str, t.Any]:
+        ids = {item["id"] for item in body["inputs"]}
+        return {
+            "results": [
+                self._record(*row)
+                for row in self.objects.get(object_type, [])
+                if row[0] in ids
+            ],
+        }
+
+    def _associations(self, after: int) -> list[dict[str, t.Any]]:
+        end = min(after + self.association_page_size, self.associations_per_record)
+        return [
+            {
+                "toObjectId": to_id,
+                "associationTypes": [
+                    {"category": "HUBSPOT_DEFINED", "typeId": 1, "label": None},
+                ],
+            }
+            for to_id in range(after, end)
+        ]
+
+    def _next_page(self, after: int) -> dict[str, t.Any]:
+        after += self.association_page_size
+        if after < self.associations_per_record:
+            return {"paging": {"next": {"after": str(after)}}}
+        return {}
+
+    def _read_associations(self, body: dict[str, t.Any]) -> dict[str, t.Any]:
+        return {
+            "status": "COMPLETE",
+            "results": [
+                {
+                    "from": {"id": item["id"]},
+                    "to": self._associations(0),
+                    **self._next_page(0),
+                }
+                for item in body["inputs"]
+                if self.associations_per_record
+            ],
+        }
+
+    def _associations_page(self, after: int) -> dict[str, t.Any]:
+        return {"results": self._associations(after), **self._next_page(after)}
+
+
+def select_streams(tap: TapHubspot, *names: str) -> dict:
+    """Return the catalog of `tap`, with only streams `names` selected."""
+    catalog = tap.catalog_dict
+    for entry in catalog["streams"]:
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = entry["tap_stream_id"] in names
+    return catalog
+
+
+@pytest.fixture
+def make_tap(hubspot: FakeHubspot) -> t.Callable[..., TapHubspot]:  # noqa: ARG001
+    """Return a factory of taps syncing the `hubspot` portal from `START_DATE`.
+
+    Taps sync the streams named in `select`, or every stream by default.
+    """
+
+    def make(
+        select: t.Iterable[str] | None = None,
+        state: dict | None = None,
+        **config: t.Any,
+    ) -> TapHubspot:
+        config = {
+            "access_token": "token",
+            "start_date": START_DATE,
+            "requests_per_ten_seconds": 10000,
+            "search_requests_per_second": 1000,
+            **config,
+        }
+        catalog = None
+        if select is not None:
+            catalog = select_streams(
+                TapHubspot(config=config, parse_env_config=False),
+                *select,
+            )
+        return TapHubspot(
+            config=config,
+            catalog=catalog,
+            state=state,
+            parse_env_config=False,
+        )
+
+    return make
+
+
+@pytest.fixture
+def hubspot(monkeypatch: pytest.MonkeyPatch) -> FakeHubspot:
+    """Serve every request the tap sends from a `FakeHubspot` portal."""
+    portal = FakeHubspot()
+    monkeypatch.setattr(HTTPAdapter, "send", portal.send)
+    return portal
@@ -0,0 +1,101 @@
+"""Tests for the asyncio request engine."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import typing as t
+
+import pytest
+import requests
+
+from tap_hubspot.aio import AsyncRequestEngine
+from tap_hubspot.ratelimit import HubspotRateLimiter
+
+if t.TYPE_CHECKING:
+    from tap_hubspot.tap import TapHubspot
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def send(self, request: requests.PreparedRequest, **_: t.Any) -> requests.Response:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        response = requests.Response()
+        response.status_code = 200
+        response.request = request
+        return response
+
+
+def _engine(session: _Session, max_in_flight: int) -> AsyncRequestEngine:
+    limiter = HubspotRateLimiter(requests_per_ten_seconds=10000)
+    return AsyncRequestEngine(session, limiter, max_in_flight)  # type: ignore[arg-type]
+
+
+def test_requests_in_flight_are_capped() -> None:
+    session = _Session()
+    engine = _engine(session, max_in_flight=3)
+
+    async def send_all() -> list[requests.Response]:
+        request = requests.Request("GET", "https://api.hubapi.com/x").prepare()
+        return await asyncio.gather(
+            *(engine.send(request, lambda r: r) for _ in range(12)),
+        )
+
+    try:
+        assert len(engine.run(send_all())) == 12
+        assert session.max_in_flight == 3
+    finally:
+        engine.close()
+
+
+def test_iterate_yields_in_order_and_reraises() -> None:
+    engine = _engine(_Session(), max_in_flight=1)
+
+    async def items() -> t.AsyncIterator[int]:
+        for i in range(5):
+            yield i
+        raise ValueError
+
+    try:
+        seen = []
+        with pytest.raises(ValueError):  # noqa: PT011
+            for item in engine.iterate(items(), buffer_size=2):
+                seen.append(item)  # noqa: PERF402
+        assert seen == [0, 1, 2, 3, 4]
+    finally:
+        engine.close()
+
+
+def test_requests_are_authenticated_off_the_loop() -> None:
+    engine = _engine(_Session(), max_in_flight=1)
+    threads = []
+
+    def auth(request: requests.PreparedRequest) -> requests.PreparedRequest:
+        threads.append(threading.current_thread())
+        return request
+
+    try:
+        request = requests.Request("GET", "https://api.hubapi.com/x").prepare()
+        engine.run(engine.send(request, auth))
+        assert threads
+        assert engine._thread not in threads  # noqa: SLF001
+    finally:
+        engine.close()
+
+
+def test_streams_prepare_requests_unauthenticated(
+    make_tap: t.Callable[..., TapHubspot],
+) -> None:
+    stream = make_tap(async_http=True).streams["contacts"]
+    request = stream.prepare_request(None, None)  # type: ignore[attr-defined]
+    assert "Authorization" not in request.headers
@@ -0,0 +1,93 @@
+"""Tests for syncing the records archived since the previous sync."""
+
+from __future__ import annotations
+
+import json
+import typing as t
+
+from tap_hubspot.client import ARCHIVED_BOOKMARK_KEY
+from tests.conftest import BASE_MS, iso
+
+if t.TYPE_CHECKING:
+    import pytest
+
+    from tap_hubspot.tap import TapHubspot
+    from tests.conftest import FakeHubspot
+
+BOOKMARK = "2024-01-01T00:00:10+00:00"
+
+
+def _archived_ids(tap: TapHubspot) -> list[str]:
+    stream = tap.streams["contacts"]
+    return [record["id"] for record in stream._get_archived_records()]  # type: ignore[attr-defined]  # noqa: SLF001
+
+
+def _state(bookmark: str) -> dict:
+    return {"bookmarks": {"contacts": {ARCHIVED_BOOKMARK_KEY: bookmark}}}
+
+
+def test_start_date_is_the_first_bookmark(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+) -> None:
+    hubspot.archived["contacts"] = [("1", BASE_MS - 1000), ("2", BASE_MS + 1000)]
+    tap = make_tap(archived_records=True)
+
+    assert _archived_ids(tap) == ["2"]
+    bookmark = tap.streams["contacts"].stream_state[ARCHIVED_BOOKMARK_KEY]
+    assert bookmark == "2024-01-01T00:00:01+00:00"
+
+
+def test_records_archived_at_the_bookmark_are_skipped(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+) -> None:
+    hubspot.archived["contacts"] = [
+        ("1", BASE_MS + 5000),
+        ("2", BASE_MS + 10_000),
+        ("3", BASE_MS + 15_000),
+        ("4", BASE_MS + 12_000),
+    ]
+    tap = make_tap(state=_state(BOOKMARK), archived_records=True)
+
+    assert _archived_ids(tap) == ["3", "4"]
+    bookmark = tap.streams["contacts"].stream_state[ARCHIVED_BOOKMARK_KEY]
+    assert bookmark == "2024-01-01T00:00:15+00:00"
+
+
+def test_bookmark_is_kept_without_newer_records(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+) -> None:
+    hubspot.archived["contacts"] = [("1", BASE_MS + 10_000)]
+    state = _state("2024-01-01T00:00:10.000Z")
+    tap = make_tap(state=state, archived_records=True)
+
+    assert _archived_ids(tap) == []
+    bookmark = tap.streams["contacts"].stream_state[ARCHIVED_BOOKMARK_KEY]
+    assert bookmark == "2024-01-01T00:00:10.000Z"
+
+
+def test_archived_records_leave_the_replication_key_bookmark_alone(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    hubspot.add_records("contacts", 3)
+    # Archived after the last live record was modified.
+    hubspot.archived["contacts"] = [("9", BASE_MS + 60_000)]
+
+    make_tap(["contacts"], archived_records=True).sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+    assert [(record["id"], record["archived"]) for record in records] == [
+        ("1", False),
+        ("2", False),
+        ("3", False),
+        ("9", True),
+    ]
+    state = next(m["value"] for m in reversed(messages) if m["type"] == "STATE")
+    bookmark = state["bookmarks"]["contacts"]
+    assert bookmark["replication_key_value"] == iso(BASE_MS + 3000)
+    assert bookmark[ARCHIVED_BOOKMARK_KEY] == "2024-01-01T00:01:00+00:00"
@@ -0,0 +1,109 @@
+"""Tests for reading the associations of the records synced."""
+
+from __future__ import annotations
+
+import json
+import typing as t
+from collections import Counter
+
+from tests.conftest import BASE_MS
+
+if t.TYPE_CHECKING:
+    import pytest
+
+    from tap_hubspot.tap import TapHubspot
+    from tests.conftest import FakeHubspot
+
+STREAMS = ("contacts", "contact_associations")
+
+
+def _records(capsys: pytest.CaptureFixture[str], stream: str) -> list[dict]:
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return [
+        message["record"]
+        for message in messages
+        if message["type"] == "RECORD" and message["stream"] == stream
+    ]
+
+
+def _batch_sizes(hubspot: FakeHubspot, to_object_type: str) -> list[int]:
+    path = f"/crm/v4/associations/contacts/{to_object_type}/batch/read"
+    return [len(body["inputs"]) for body in hubspot.requests_to(path)]
+
+
+def test_ids_are_read_in_batches_across_workers(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    hubspot.add_records("contacts", 2500)
+    hubspot.associations_per_record = 1
+
+    make_tap(STREAMS, association_read_workers=2).sync_all()
+
+    # Two batches of 1000 ids for the workers, then the rest once synced.
+    assert sorted(_batch_sizes(hubspot, "companies")) == [500, 1000, 1000]
+    assert sorted(_batch_sizes(hubspot, "deals")) == [500, 1000, 1000]
+    records = _records(capsys, "contact_associations")
+    assert Counter(record["to_object_type"] for record in records) == {
+        "companies": 2500,
+        "deals": 2500,
+    }
+    assert {record["from_id"] for record in records} == {str(i) for i in range(1, 2501)}
+
+
+def test_last_partial_batch_is_read_at_the_end_of_the_sync(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    hubspot.add_records("contacts", 3)
+    hubspot.associations_per_record = 2
+
+    make_tap(STREAMS).sync_all()
+
+    assert _batch_sizes(hubspot, "companies") == [3]
+    assert _batch_sizes(hubspot, "deals") == [3]
+    assert len(_records(capsys, "contact_associations")) == 12  # noqa: PLR2004
+
+
+def test_archived_records_are_not_handed_over(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    hubspot.add_records("contacts", 2)
+    hubspot.archived["contacts"] = [("90", BASE_MS + 5000), ("91", BASE_MS + 6000)]
+    hubspot.associations_per_record = 1
+    tap = make_tap(STREAMS, archived_records=True)
+
+    tap.sync_all()
+
+    assert len(_records(capsys, "contacts")) == 4  # noqa: PLR2004
+    path = "/crm/v4/associations/contacts/companies/batch/read"
+    assert [item["id"] for item in hubspot.requests_to(path)[0]["inputs"]] == [
+        "1",
+        "2",
+    ]
+    stream = tap.streams["contacts"]
+    assert stream.get_child_context({"id": "90", "archived": True}, None) is None
+
+
+def test_truncated_associations_are_read_to_the_end(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    hubspot.add_records("contacts", 2)
+    hubspot.associations_per_record = 5
+    hubspot.association_page_size = 2
+
+    make_tap(STREAMS).sync_all()
+
+    records = _records(capsys, "contact_associations")
+    to_ids = Counter((r["from_id"], r["to_object_type"], r["to_id"]) for r in records)
+    assert set(to_ids.values()) == {1}
+    assert len(to_ids) == 2 * 2 * 5
+    # Two more pages of associations per record and associated object type.
+    pages = hubspot.requests_to("/crm/v4/objects/contacts/1/associations/deals")
+    assert [page["after"] for page in pages] == ["2", "4"]
@@ -0,0 +1,91 @@
+"""Tests for the shared OAuth access tokens."""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from tap_hubspot.auth import AccessToken, OAuthTokenManager
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+CONFIG = {"client_id": "app", "client_secret": "secret", "refresh_token": "refresh"}
+
+
+class FakeTokenSession:
+    """Issues `token-1`, `token-2`, ... valid for `expires_in` seconds."""
+
+    def __init__(self, expires_in: int = 1800, latency: float = 0) -> None:
+        self.expires_in = expires_in
+        self.latency = latency
+        self.issued = 0
+        self._lock = threading.Lock()
+
+    def post(self, *args: t.Any, **kwargs: t.Any) -> requests.Response:  # noqa: ARG002
+        time.sleep(self.latency)
+        with self._lock:
+            self.issued += 1
+            issued = self.issued
+        response = requests.Response()
+        response.status_code = 200
+        response._content = (  # noqa: SLF001
+            f'{{"access_token": "token-{issued}", "expires_in": {self.expires_in}}}'
+        ).encode()
+        return response
+
+
+def _manager(session: FakeTokenSession, **kwargs: t.Any) -> OAuthTokenManager:
+    return OAuthTokenManager(CONFIG, session, **kwargs)  # type: ignore[arg-type]
+
+
+def test_concurrent_requests_share_one_refresh() -> None:
+    session = FakeTokenSession(latency=0.05)
+    manager = _manager(session)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        tokens = set(executor.map(lambda _: manager.access_token(), range(64)))
+    assert tokens == {"token-1"}
+    assert session.issued == 1
+
+
+def test_token_is_refreshed_before_it_expires() -> None:
+    session = FakeTokenSession()
+    manager = _manager(session, refresh_margin=300)
+    manager._token = AccessToken("old", refresh_at=0, expires_at=time.time() + 60)  # noqa: SLF001
+    assert manager.access_token() == "token-1"
+    assert manager.access_token() == "token-1"
+
+
+def test_short_lived_tokens_are_refreshed_halfway() -> None:
+    token = AccessToken.issued("token", issued_at=0, expires_in=60, refresh_margin=300)
+    assert token.refresh_at == 30  # noqa: PLR2004
+
+
+def test_rejected_token_is_refreshed_once() -> None:
+    session = FakeTokenSession()
+    manager = _manager(session)
+    rejected = manager.access_token()
+    manager.reject(rejected)
+    manager.reject(rejected)
+    assert manager.access_token() == "token-2"
+    manager.reject(rejected)
+    assert manager.access_token() == "token-2"
+
+
+def test_token_is_cached_between_runs(tmp_path: Path) -> None:
+    cache_path = str(tmp_path / "token.json")
+    session = FakeTokenSession()
+    assert _manager(session, cache_path=cache_path).access_token() == "token-1"
+    assert _manager(session, cache_path=cache_path).access_token() == "token-1"
+    assert session.issued == 1
+
+    other_app = OAuthTokenManager(
+        {**CONFIG, "refresh_token": "other"},
+        session,  # type: ignore[arg-type]
+        cache_path=cache_path,
+    )
+    assert other_app.access_token() == "token-2"
@@ -0,0 +1,20 @@
+"""Tests for decoding HubSpot responses."""
+
+from __future__ import annotations
+
+import decimal
+
+import requests
+
+from tap_hubspot.client import response_json
+
+
+def test_non_integer_numbers_are_decoded_as_decimals() -> None:
+    response = requests.Response()
+    response._content = b'{"amount": 1.5, "count": 2}'  # noqa: SLF001
+
+    body = response_json(response)
+
+    assert body == {"amount": decimal.Decimal("1.5"), "count": 2}
+    assert isinstance(body["amount"], decimal.Decimal)
+    assert response_json(response) is body
@@ -0,0 +1,62 @@
+"""Tests for the worker thread helpers."""
+
+from __future__ import annotations
+
+import time
+import typing as t
+
+import pytest
+
+from tap_hubspot.concurrency import iter_ahead, iter_in_order, map_in_order
+
+
+def _producer(start: int, count: int) -> t.Callable[[], t.Iterable[int]]:
+    return lambda: range(start, start + count)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_iter_in_order_keeps_producer_order(max_workers: int) -> None:
+    producers = [_producer(i * 100, 100) for i in range(10)]
+    result = list(iter_in_order(producers, max_workers=max_workers, buffer_size=5))
+    assert result == list(range(1000))
+
+
+def test_iter_in_order_reraises_producer_errors() -> None:
+    def failing() -> t.Iterable[int]:
+        yield 1
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    producers = [_producer(0, 1), failing, _producer(10, 1)]
+    with pytest.raises(RuntimeError, match="boom"):
+        list(iter_in_order(producers, max_workers=2))
+
+
+def test_iter_in_order_stops_workers_when_closed() -> None:
+    producers = [_producer(i * 1000, 1000) for i in range(4)]
+    items = iter_in_order(producers, max_workers=4, buffer_size=1)
+    assert next(items) == 0
+    items.close()  # type: ignore[attr-defined]
+
+
+def test_iter_ahead_stays_within_buffer() -> None:
+    produced = []
+
+    def producer() -> t.Iterable[int]:
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    items = iter_ahead(producer, buffer_size=2)
+    assert next(items) == 0
+    time.sleep(0.05)
+    # The item handed over, two buffered and one waiting for space.
+    assert len(produced) <= 4
+    items.close()  # type: ignore[attr-defined]
+    assert list(iter_ahead(producer, buffer_size=2)) == list(range(100))
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_map_in_order_keeps_input_order(max_workers: int) -> None:
+    result = list(map_in_order(lambda x: x * 2, iter(range(50)), max_workers))
+    assert result == [x * 2 for x in range(50)]
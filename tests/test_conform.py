@@ -0,0 +1,70 @@
+"""Tests for the compiled record conformer."""
+
+from __future__ import annotations
+
+import copy
+
+from singer_sdk import typing as th
+from singer_sdk._singerlib import SelectionMask
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import (
+    TypeConformanceLevel,
+    _conform_record_data_types,
+)
+
+from tap_hubspot.conform import RecordConformer
+
+SCHEMA = th.PropertiesList(
+    th.Property("id", th.StringType),
+    th.Property(
+        "properties",
+        th.ObjectType(
+            th.Property("email", th.StringType),
+            th.Property("amount", th.NumberType),
+            th.Property("secret", th.StringType),
+        ),
+    ),
+    th.Property("archived", th.BooleanType),
+    th.Property(
+        "tags",
+        th.ArrayType(th.ObjectType(th.Property("name", th.StringType))),
+    ),
+    th.Property("associations", th.ObjectType()),
+).to_dict()
+
+RECORD = {
+    "id": "1",
+    "properties": {"email": "a@b.c", "amount": 1.5, "secret": "x", "extra": "y"},
+    "archived": False,
+    "tags": [{"name": "a", "color": "red"}],
+    "associations": {"companies": ["2"]},
+    "unknown": 3,
+}
+
+
+def _sdk_conform(record: dict, mask: SelectionMask) -> tuple[dict, list[str]]:
+    pop_deselected_record_properties(record, SCHEMA, mask)
+    return _conform_record_data_types(
+        record,
+        SCHEMA,
+        TypeConformanceLevel.RECURSIVE,
+        None,
+    )
+
+
+def test_matches_sdk_conformance() -> None:
+    mask = SelectionMask({("properties", "properties", "properties", "secret"): False})
+    expected, expected_unmapped = _sdk_conform(copy.deepcopy(RECORD), mask)
+    record, unmapped = RecordConformer(SCHEMA, mask)(copy.deepcopy(RECORD))
+
+    assert record == expected
+    assert sorted(unmapped) == sorted(expected_unmapped)
+    assert "secret" not in record["properties"]
+
+
+def test_non_object_values_are_kept() -> None:
+    record, unmapped = RecordConformer(SCHEMA, SelectionMask())(
+        {"id": "1", "properties": None, "tags": None},
+    )
+    assert record == {"id": "1", "properties": None, "tags": None}
+    assert unmapped == []
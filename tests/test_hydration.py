@@ -0,0 +1,43 @@
+"""Tests for hydrating pages of ids via batch/read."""
+
+from __future__ import annotations
+
+import typing as t
+
+if t.TYPE_CHECKING:
+    import pytest
+
+    from tap_hubspot.tap import TapHubspot
+    from tests.conftest import FakeHubspot
+
+
+def test_search_windows_are_hydrated_from_the_object_path(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+) -> None:
+    hubspot.add_records("contacts", 250)
+    stream = make_tap(batch_read_hydration=True).streams["contacts"]
+    stream._write_starting_replication_value(None)  # noqa: SLF001
+
+    records = t.cast("list[dict]", list(stream.get_records(None)))
+
+    assert [record["id"] for record in records] == [str(i) for i in range(1, 251)]
+    assert records[0]["properties"]["email"] == "1@example.com"
+    assert hubspot.requests_to("/crm/v3/objects/contacts/search")
+    assert len(hubspot.requests_to("/crm/v3/objects/contacts/batch/read")) == 3  # noqa: PLR2004
+
+
+def test_batch_read_warns_when_most_records_are_missing(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    hubspot.add_records("contacts", 2)
+    stream = make_tap(batch_read_hydration=True).streams["contacts"]
+    ids = [{"id": str(i)} for i in range(1, 6)]
+
+    records = stream._batch_read(ids)  # type: ignore[attr-defined]  # noqa: SLF001
+
+    assert [record["id"] for record in records] == ["1", "2"]
+    # The tap's loggers log to stderr without propagating.
+    assert "returned only 2 of 5 records" in capfd.readouterr().err
@@ -0,0 +1,69 @@
+"""Tests for the per-stream instrumentation."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import typing as t
+
+import requests
+
+from tap_hubspot.instrumentation import MetricsRegistry, StreamMetrics
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def _response(status: int, latency: float, content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.elapsed = datetime.timedelta(seconds=latency)
+    response._content = content  # noqa: SLF001
+    response.headers["X-HubSpot-RateLimit-Remaining"] = "42"
+    return response
+
+
+def test_observe_response_counts_bytes_latency_and_throttling() -> None:
+    metrics = StreamMetrics("contacts")
+    metrics.observe_response(_response(200, 0.07, b"{}"))
+    metrics.observe_response(_response(429, 3.0, b"{}"))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["requests"] == 2  # noqa: PLR2004
+    assert snapshot["counters"]["response_bytes"] == 4  # noqa: PLR2004
+    assert snapshot["counters"]["throttled_responses"] == 1
+    assert snapshot["rate_limit_remaining"] == 42  # noqa: PLR2004
+    # Buckets up to 0.1s and up to 5s.
+    assert snapshot["latency_counts"][1] == 1
+    assert snapshot["latency_counts"][6] == 1
+
+
+def test_report_logs_metric_lines_and_writes_textfile(
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    textfile = tmp_path / "tap_hubspot.prom"
+    registry = MetricsRegistry(textfile=str(textfile))
+    metrics = registry.stream("deals")
+    metrics.increment("records", 3)
+    metrics.add_time("parse", 0.5)
+
+    with caplog.at_level(logging.INFO, logger="singer_sdk.metrics"):
+        registry.report()
+
+    points = [
+        json.loads(record.getMessage().removeprefix("METRIC: "))
+        for record in caplog.records
+    ]
+    assert {
+        "type": "counter",
+        "metric": "hubspot.records",
+        "value": 3,
+        "tags": {"stream": "deals", "pid": points[0]["tags"]["pid"]},
+    } in points
+    text = textfile.read_text()
+    assert 'tap_hubspot_records_total{stream="deals"} 3' in text
+    assert 'tap_hubspot_stage_seconds_total{stream="deals",stage="parse"} 0.5' in text
@@ -0,0 +1,51 @@
+"""Tests for the per-stream profilers."""
+
+from __future__ import annotations
+
+import pstats
+import typing as t
+
+from tap_hubspot.profiling import ProfilerRegistry, profile_dir
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def _parent_work() -> int:
+    return sum(range(1000))
+
+
+def _child_work() -> int:
+    return sum(range(1000))
+
+
+def _functions(path: Path) -> set[str]:
+    stats = pstats.Stats(str(path))
+    return {function for _, _, function in stats.stats}  # type: ignore[attr-defined]
+
+
+def test_nested_sessions_profile_their_own_stream(tmp_path: Path) -> None:
+    registry = ProfilerRegistry(tmp_path)
+    parent, child = registry.stream("contacts"), registry.stream("contact_associations")
+    with parent.session():
+        _parent_work()
+        with child.session():
+            _child_work()
+            with parent.session():
+                _parent_work()
+    registry.write()
+
+    assert "_parent_work" in _functions(tmp_path / "contacts.pstats")
+    assert "_child_work" not in _functions(tmp_path / "contacts.pstats")
+    assert "_child_work" in _functions(tmp_path / "contact_associations.pstats")
+    assert (tmp_path / "contacts.txt").read_text()
+
+
+def test_profile_dir_falls_back_to_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("TAP_HUBSPOT_PROFILE_DIR", raising=False)
+    assert profile_dir({}) is None
+    monkeypatch.setenv("TAP_HUBSPOT_PROFILE_DIR", "profiles")
+    assert str(profile_dir({})) == "profiles"
+    assert str(profile_dir({"profile_dir": "elsewhere"})) == "elsewhere"
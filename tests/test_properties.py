@@ -0,0 +1,135 @@
+"""Tests for the property definition cache."""
+
+from __future__ import annotations
+
+import decimal
+import itertools
+import json
+import types
+import typing as t
+
+import requests
+
+from tap_hubspot.client import MAX_PROPERTIES_PARAM_LENGTH, DynamicHubspotStream
+from tap_hubspot.properties import (
+    PropertyCache,
+    compile_coercers,
+    property_datatype,
+)
+
+if t.TYPE_CHECKING:
+    from tap_hubspot.tap import TapHubspot
+
+RESULTS = [{"name": "email", "type": "string"}]
+
+
+class _Endpoint:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, str]] = []
+
+    def __call__(self, headers: dict[str, str]) -> requests.Response:
+        self.calls.append(headers)
+        response = requests.Response()
+        if headers.get("If-None-Match") == '"v1"':
+            response.status_code = 304
+            return response
+        response.status_code = 200
+        response.headers["ETag"] = '"v1"'
+        response._content = json.dumps({"results": RESULTS}).encode()  # noqa: SLF001
+        return response
+
+
+def test_fresh_entries_are_read_from_disk(tmp_path: t.Any) -> None:  # noqa: ANN401
+    endpoint = _Endpoint()
+    assert PropertyCache("portal", str(tmp_path)).get("contacts", endpoint) == RESULTS
+    assert PropertyCache("portal", str(tmp_path)).get("contacts", endpoint) == RESULTS
+    assert len(endpoint.calls) == 1
+
+
+def test_stale_entries_are_revalidated(tmp_path: t.Any) -> None:  # noqa: ANN401
+    endpoint = _Endpoint()
+    PropertyCache("portal", str(tmp_path)).get("contacts", endpoint)
+    cache = PropertyCache("portal", str(tmp_path), ttl=0)
+    assert cache.get("contacts", endpoint) == RESULTS
+    assert endpoint.calls[-1] == {"If-None-Match": '"v1"'}
+
+
+def _select(config: dict, excluded: tuple[str, ...] = ()) -> list[str]:
+    stream = types.SimpleNamespace(
+        name="emails",
+        replication_key="hs_lastmodifieddate",
+        config={"stream_properties": {"emails": config}},
+        included_properties=None,
+        excluded_properties=excluded,
+    )
+    properties = dict.fromkeys(
+        ["hs_lastmodifieddate", "hs_email_html", "hs_email_subject", "hs_email_text"],
+        "string",
+    )
+    return list(DynamicHubspotStream._select_properties(stream, properties))  # type: ignore[arg-type]  # noqa: SLF001
+
+
+def test_property_selection() -> None:
+    excluded = ("hs_email_html", "hs_email_text")
+    assert _select({}, excluded) == ["hs_lastmodifieddate", "hs_email_subject"]
+    assert _select({"include": ["hs_email_html"]}, excluded) == [
+        "hs_lastmodifieddate",
+        "hs_email_html",
+    ]
+    assert _select({"exclude": ["hs_email_subject", "hs_lastmodifieddate"]}) == [
+        "hs_lastmodifieddate",
+        "hs_email_html",
+        "hs_email_text",
+    ]
+
+
+def test_property_groups_fit_in_url() -> None:
+    names = [f"custom_property_{i:04}" for i in range(1000)]
+    stream = types.SimpleNamespace(
+        replication_key="hs_lastmodifieddate",
+        _page_properties=lambda: [*names, "hs_lastmodifieddate"],
+    )
+    groups = DynamicHubspotStream._property_groups(stream)  # type: ignore[arg-type]  # noqa: SLF001
+    assert len(groups) > 1
+    assert groups[0][0] == "hs_lastmodifieddate"
+    assert sorted(itertools.chain(*groups)) == sorted([*names, "hs_lastmodifieddate"])
+    assert all(
+        len(",".join(group)) + 2 * len(group) <= MAX_PROPERTIES_PARAM_LENGTH
+        for group in groups
+    )
+
+
+def test_typed_properties() -> None:
+    definitions = {
+        "amount": {"type": "number", "fieldType": "number"},
+        "closedate": {"type": "datetime", "fieldType": "date"},
+        "birthday": {"type": "date", "fieldType": "date"},
+        "opted_in": {"type": "enumeration", "fieldType": "booleancheckbox"},
+        "stage": {"type": "enumeration", "fieldType": "select"},
+    }
+    assert property_datatype(definitions["amount"]).to_dict()["type"] == ["number"]
+    assert property_datatype(definitions["stage"]).to_dict()["type"] == ["string"]
+
+    coercers = compile_coercers(definitions)
+    assert "stage" not in coercers
+    assert coercers["amount"]("12.50") == decimal.Decimal("12.50")
+    assert coercers["amount"]("") is None
+    assert coercers["closedate"]("0") == "1970-01-01T00:00:00+00:00"
+    assert coercers["closedate"]("2024-01-02T03:04:05Z") == "2024-01-02T03:04:05Z"
+    assert coercers["birthday"]("86400000") == "1970-01-02"
+    assert coercers["opted_in"]("true") is True
+    # Values that do not parse are dropped rather than mistyped.
+    assert coercers["amount"]("n/a") is None
+    assert coercers["amount"]("NaN") is None
+    assert coercers["opted_in"]("yes") is None
+
+
+def test_properties_are_strings_unless_typed(
+    make_tap: t.Callable[..., TapHubspot],
+) -> None:
+    def modified_schema(tap: TapHubspot) -> dict:
+        properties = tap.streams["deals"].schema["properties"]["properties"]
+        return properties["properties"]["hs_lastmodifieddate"]
+
+    assert "format" not in modified_schema(make_tap())
+    assert modified_schema(make_tap(typed_properties=True))["format"] == "date-time"
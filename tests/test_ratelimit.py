@@ -0,0 +1,56 @@
+"""Tests for the shared HubSpot rate limiter."""
+
+from __future__ import annotations
+
+import requests
+
+from tap_hubspot.ratelimit import HubspotRateLimiter, TokenBucket
+
+
+def _response(url: str, headers: dict[str, str]) -> requests.Response:
+    response = requests.Response()
+    response.request = requests.Request("GET", url).prepare()
+    response.headers.update(headers)
+    return response
+
+
+def test_bucket_allows_burst_then_waits() -> None:
+    bucket = TokenBucket(capacity=2, interval=1)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.4 < bucket.reserve() <= 0.5
+
+
+def test_search_requests_use_their_own_bucket() -> None:
+    limiter = HubspotRateLimiter()
+    search_url = "https://api.hubapi.com/crm/v3/objects/contacts/search"
+    list_url = "https://api.hubapi.com/crm/v3/objects/contacts?limit=100"
+    assert limiter.bucket_for(search_url) is limiter.search
+    assert limiter.bucket_for(list_url) is limiter.default
+
+
+def test_update_calibrates_from_headers() -> None:
+    limiter = HubspotRateLimiter(requests_per_ten_seconds=100)
+    limiter.update(
+        _response(
+            "https://api.hubapi.com/crm/v3/objects/contacts",
+            {
+                "X-HubSpot-RateLimit-Max": "190",
+                "X-HubSpot-RateLimit-Interval-Milliseconds": "10000",
+                "X-HubSpot-RateLimit-Remaining": "0",
+            },
+        ),
+    )
+    assert limiter.default.capacity == 190  # noqa: PLR2004
+    assert limiter.default.reserve() > 0
+
+
+def test_retry_after_pauses_bucket() -> None:
+    limiter = HubspotRateLimiter()
+    limiter.update(
+        _response(
+            "https://api.hubapi.com/crm/v3/objects/contacts",
+            {"Retry-After": "2"},
+        ),
+    )
+    assert limiter.default.reserve() > 1
@@ -0,0 +1,140 @@
+"""Tests for paging through search windows."""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import types
+import typing as t
+
+from singer_sdk._singerlib.utils import strptime_to_utc
+
+from tap_hubspot import client
+from tap_hubspot.client import (
+    DynamicIncrementalHubspotStream,
+    HubspotStream,
+    SearchWindow,
+)
+from tap_hubspot.instrumentation import StreamMetrics
+from tests.conftest import BASE_MS, iso
+
+if t.TYPE_CHECKING:
+    import pytest
+
+    from tap_hubspot.tap import TapHubspot
+    from tests.conftest import FakeHubspot
+
+T0 = "2024-01-01T00:00:00.000Z"
+T1 = "2024-01-01T00:00:00.001Z"
+T0_MS = 1704067200000
+
+
+def _stream() -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        replication_key="lastmodifieddate",
+        name="contacts",
+        logger=logging.getLogger(__name__),
+        stream_metrics=StreamMetrics("contacts"),
+    )
+
+
+def _page(*records: tuple[str, str]) -> list[dict]:
+    return [
+        {"id": record_id, "properties": {"lastmodifieddate": value}}
+        for record_id, value in records
+    ]
+
+
+def _received(stream: types.SimpleNamespace, window: SearchWindow, page: list) -> list:
+    received = DynamicIncrementalHubspotStream._page_received(stream, page, window)  # type: ignore[arg-type]  # noqa: SLF001
+    return [record["id"] for record in received]
+
+
+def test_restarted_window_skips_records_at_its_cursor() -> None:
+    stream = _stream()
+    window = SearchWindow(T0_MS, T0_MS + 10)
+    assert _received(stream, window, _page(("1", T0), ("2", T1), ("3", T1))) == [
+        "1",
+        "2",
+        "3",
+    ]
+
+    DynamicIncrementalHubspotStream._restart_window(stream, window)  # type: ignore[arg-type]  # noqa: SLF001
+    assert window["window_start"] == T0_MS + 1
+    assert window.next is None
+    assert _received(stream, window, _page(("2", T1), ("3", T1), ("4", T1))) == ["4"]
+
+
+def test_crowded_millisecond_is_paged_by_id() -> None:
+    stream = _stream()
+    window = SearchWindow(T0_MS, T0_MS + 10)
+    assert _received(stream, window, _page(("5", T0), ("2", T0))) == ["5", "2"]
+
+    DynamicIncrementalHubspotStream._restart_window(stream, window)  # type: ignore[arg-type]  # noqa: SLF001
+    assert window["window_end"] == T0_MS + 1
+    assert window["after_id"] == "0"
+    assert window.next is not None
+    assert window.next["window_start"] == T0_MS + 1
+    assert window.next["window_end"] == T0_MS + 10
+    assert _received(stream, window, _page(("2", T0), ("3", T0), ("5", T0))) == ["3"]
+
+    DynamicIncrementalHubspotStream._restart_window(stream, window)  # type: ignore[arg-type]  # noqa: SLF001
+    assert window["after_id"] == "5"
+
+
+def test_records_from_end_date_are_dropped() -> None:
+    stream = _stream()
+    stream._end_date = strptime_to_utc(T1)  # noqa: SLF001
+    is_past_end_date = HubspotStream._is_past_end_date  # noqa: SLF001
+    stream._is_past_end_date = functools.partial(is_past_end_date, stream)  # type: ignore[arg-type]  # noqa: SLF001
+    page = _page(("1", T0), ("2", T1))
+    received = HubspotStream._page_received(stream, page, None)  # type: ignore[arg-type]  # noqa: SLF001
+    assert [record["id"] for record in received] == ["1"]
+
+    stream.is_sorted = False
+    assert not HubspotStream._reached_end_date(stream, page)  # type: ignore[arg-type]  # noqa: SLF001
+    stream.is_sorted = True
+    assert HubspotStream._reached_end_date(stream, page)  # type: ignore[arg-type]  # noqa: SLF001
+    assert not HubspotStream._reached_end_date(stream, page[:1])  # type: ignore[arg-type]  # noqa: SLF001
+
+
+def _search_records(stream: t.Any) -> list[dict]:  # noqa: ANN401
+    stream._write_starting_replication_value(None)  # noqa: SLF001
+    return list(stream._get_search_records())  # noqa: SLF001
+
+
+def test_checkpoints_are_written_and_resumed_from(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Small enough for the records to be spread over several windows.
+    monkeypatch.setattr(client, "SEARCH_RESULT_LIMIT", 150)
+    hubspot.add_records("contacts", 250)
+    config = {
+        "checkpoint_interval_records": 100,
+        "checkpoint_interval_seconds": 0,
+        "max_parallel_search_windows": 2,
+    }
+
+    records = _search_records(make_tap(**config).streams["contacts"])
+
+    assert [record["id"] for record in records] == [str(i) for i in range(1, 251)]
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    states = [m["value"] for m in messages if m["type"] == "STATE"]
+    assert [
+        state["bookmarks"]["contacts"]["replication_key_value"] for state in states
+    ] == [iso(BASE_MS + 100_000), iso(BASE_MS + 200_000)]
+
+    sent = len(hubspot.requests_to("/crm/v3/objects/contacts/search"))
+    resumed = make_tap(state=states[-1], **config).streams["contacts"]
+    records = _search_records(resumed)
+
+    # The last record checkpointed is read again, then the ones after it.
+    assert [record["id"] for record in records] == [str(i) for i in range(200, 251)]
+    searches = hubspot.requests_to("/crm/v3/objects/contacts/search")[sent:]
+    assert searches[0]["filterGroups"][0]["filters"][0]["value"] == str(
+        BASE_MS + 200_000,
+    )
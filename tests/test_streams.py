@@ -0,0 +1,97 @@
+"""Tests for the streams of individual HubSpot objects."""
+
+from __future__ import annotations
+
+import json
+import typing as t
+
+from tests.conftest import BASE_MS, PROPERTIES, iso
+
+if t.TYPE_CHECKING:
+    import pytest
+
+    from tap_hubspot.tap import TapHubspot
+    from tests.conftest import FakeHubspot
+
+
+def test_properties_of_every_object_are_merged_in_order(
+    make_tap: t.Callable[..., TapHubspot],
+) -> None:
+    stream = make_tap(max_parallel_property_endpoints=4).streams["properties"]
+
+    records = t.cast("list[dict]", list(stream.get_records(None)))
+
+    objects = [
+        "tickets",
+        "deals",
+        "contacts",
+        "company",
+        "product",
+        "line_item",
+        "email",
+        "postal_mail",
+        "call",
+        "goal_targets",
+        "meeting",
+        "task",
+        "communication",
+        "notes",
+    ]
+    assert [(record["hubspot_object"], record["name"]) for record in records] == [
+        (hubspot_object, definition["name"])
+        for hubspot_object in objects
+        for definition in PROPERTIES
+    ]
+
+
+def _last_bookmark(output: str, stream: str) -> dict:
+    messages = [json.loads(line) for line in output.splitlines()]
+    states = [m["value"] for m in messages if m["type"] == "STATE"]
+    return states[-1]["bookmarks"][stream]
+
+
+def test_products_are_searched_from_the_start_date(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    hubspot.add_records("products", 3)
+
+    make_tap(["products"]).sync_all()
+
+    searches = hubspot.requests_to("/crm/v3/objects/products/search")
+    pages = [search for search in searches if search["limit"] > 1]
+    assert len(pages) == 1
+    assert pages[0]["filterGroups"][0]["filters"][0] == {
+        "propertyName": "hs_lastmodifieddate",
+        "operator": "GTE",
+        "value": str(BASE_MS),
+    }
+    assert pages[0]["sorts"] == [
+        {"propertyName": "hs_lastmodifieddate", "direction": "ASCENDING"},
+    ]
+    assert set(pages[0]["properties"]) == {
+        definition["name"] for definition in PROPERTIES
+    }
+    assert not hubspot.requests_to("/crm/v3/objects/products")
+    assert _last_bookmark(capsys.readouterr().out, "products") == {
+        "replication_key": "hs_lastmodifieddate",
+        "replication_key_value": iso(BASE_MS + 3000),
+    }
+
+
+def test_products_are_listed_without_a_start_date(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    hubspot.add_records("products", 3)
+
+    make_tap(["products"], start_date=None).sync_all()
+
+    assert not hubspot.requests_to("/crm/v3/objects/products/search")
+    assert len(hubspot.requests_to("/crm/v3/objects/products")) == 1
+    assert _last_bookmark(capsys.readouterr().out, "products") == {
+        "replication_key": "hs_lastmodifieddate",
+        "replication_key_value": iso(BASE_MS + 3000),
+    }
@@ -0,0 +1,92 @@
+"""Tests for syncing every selected stream."""
+
+from __future__ import annotations
+
+import copy
+import json
+import types
+import typing as t
+from collections import Counter
+
+from singer_sdk.streams import core
+
+if t.TYPE_CHECKING:
+    import pytest
+    from singer_sdk import Stream
+
+    from tap_hubspot.tap import TapHubspot
+    from tests.conftest import FakeHubspot
+
+
+def test_parallel_streams_write_valid_messages_and_state(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    hubspot.add_records("contacts", 1500)
+    hubspot.add_records("deals", 1200)
+    config = {"max_parallel_streams": 2, "checkpoint_interval_records": 10}
+    tap = make_tap(["contacts", "deals"], **config)
+    # The SDK deep-copies the state shared by the streams after writing it.
+    copied_unlocked = []
+
+    def deepcopy(value: t.Any) -> t.Any:  # noqa: ANN401
+        copied_unlocked.append(not tap.message_lock._is_owned())  # type: ignore[attr-defined]  # noqa: SLF001
+        return copy.deepcopy(value)
+
+    checked_copy = types.SimpleNamespace(copy=copy.copy, deepcopy=deepcopy)
+    monkeypatch.setattr(core, "copy", checked_copy)
+
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = Counter(m["stream"] for m in messages if m["type"] == "RECORD")
+    assert records == {"contacts": 1500, "deals": 1200}
+    states = [m["value"] for m in messages if m["type"] == "STATE"]
+    assert len(states) > 200  # noqa: PLR2004
+    assert copied_unlocked
+    assert not any(copied_unlocked)
+    bookmarks = states[-1]["bookmarks"]
+    assert bookmarks["contacts"]["replication_key_value"] == "2024-01-01T00:25:00.000Z"
+    assert bookmarks["deals"]["replication_key_value"] == "2024-01-01T00:20:00.000Z"
+
+
+def test_bookmarks_are_created_before_the_streams_sync(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    hubspot.add_records("contacts", 10)
+    hubspot.add_records("deals", 10)
+    streams = ["contacts", "contact_associations", "deals", "deal_associations"]
+    tap = make_tap(streams, max_parallel_streams=2)
+    sync_stream = tap._sync_stream  # noqa: SLF001
+    bookmarks_at_start = []
+
+    def record_bookmarks(stream: Stream) -> None:
+        with tap.message_lock:
+            bookmarks_at_start.append(set(tap.state["bookmarks"]))
+        sync_stream(stream)
+
+    monkeypatch.setattr(tap, "_sync_stream", record_bookmarks)
+
+    tap.sync_all()
+
+    # Child streams' entries too, which the parents' workers would add.
+    assert bookmarks_at_start == [set(streams), set(streams)]
+
+
+def test_async_engine_is_closed_after_the_sync(
+    hubspot: FakeHubspot,
+    make_tap: t.Callable[..., TapHubspot],
+) -> None:
+    hubspot.add_records("contacts", 300)
+    tap = make_tap(["contacts"], async_http=True)
+    engine = tap.http_engine
+    assert engine is not None
+
+    tap.sync_all()
+
+    assert not engine._thread.is_alive()  # noqa: SLF001
+    assert tap._http_engine is None  # noqa: SLF001
@@ -0,0 +1,19 @@
+"""Tests for the clients the tap shares between its streams."""
+
+from __future__ import annotations
+
+import typing as t
+
+if t.TYPE_CHECKING:
+    from tap_hubspot.tap import TapHubspot
+
+
+def test_only_connection_failures_are_retried(
+    make_tap: t.Callable[..., TapHubspot],
+) -> None:
+    session = make_tap(http_max_retries=2).http_session
+    retry = session.get_adapter("https://api.hubapi.com").max_retries  # type: ignore[attr-defined]
+
+    assert retry.total == 2  # noqa: PLR2004
+    assert retry.connect == 2  # noqa: PLR2004
+    assert (retry.read, retry.status, retry.other) == (0, 0, 0)